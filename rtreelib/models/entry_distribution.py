@@ -1,6 +1,6 @@
-from typing import Tuple
+from typing import Tuple, Optional, FrozenSet
 from .rect import Rect, union_all
-from ..rtree import EntryDivision
+from ..rtree import RTreeEntry, EntryDivision
 
 
 class EntryDistribution:
@@ -11,17 +11,30 @@ class EntryDistribution:
     the list of distributions can be used as part of a set (as required by RStarStat).
     """
 
-    def __init__(self, division: EntryDivision):
+    __slots__ = ('division', 'set1', 'set2', '_key', '_hash', 'rects', 'overlap', 'perimeter')
+
+    def __init__(self, division: EntryDivision, rects: Optional[Tuple[Rect, Rect]] = None,
+                 key: Optional[FrozenSet[FrozenSet[RTreeEntry]]] = None):
         """
         Creates an RStarDistribution from an EntryDivision.
         :param division: Entry division. Note that an EntryDivision is nothing more than a type alias for a tuple
             containing two lists of entries.
+        :param rects: Optional bounding rectangles of the two groups in the division. If not given, they are computed
+            from the entries in each group.
+        :param key: Optional canonical form of the division (as returned by get_key), if already known. If not given,
+            it is computed from the division.
         """
         self.division = division
         self.set1 = set(division[0])
         self.set2 = set(division[1])
-        r1 = union_all([e.rect for e in division[0]])
-        r2 = union_all([e.rect for e in division[1]])
+        # Distributions are compared and hashed by their two groups of entries, independent of order. The canonical
+        # form (and its hash) is computed once here, rather than rebuilding sets on every comparison.
+        self._key = key if key is not None else self.get_key(division)
+        self._hash = hash(self._key)
+        if rects is None:
+            rects = (union_all([e.rect for e in division[0]]), union_all([e.rect for e in division[1]]))
+        r1, r2 = rects
+        self.rects = rects
         self.overlap = r1.get_intersection_area(r2)
         self.perimeter = r1.perimeter() + r2.perimeter()
 
@@ -32,27 +45,32 @@ class EntryDistribution:
         :param division: Entry division
         :return: True if the entry division may be considered equivalent to this distribution
         """
-        set1 = set(division[0])
-        set2 = set(division[1])
-        return (self.set1 == set1 and self.set2 == set2) or (self.set1 == set2 and self.set2 == set1)
+        return self._key == self.get_key(division)
+
+    @staticmethod
+    def get_key(division: EntryDivision) -> FrozenSet[FrozenSet[RTreeEntry]]:
+        """
+        Returns the canonical form of an entry division, which is the same for all equivalent divisions (see
+        is_division_equivalent). Distributions are compared and hashed by this value.
+        :param division: Entry division
+        :return: Canonical form of the entry division
+        """
+        return frozenset((frozenset(division[0]), frozenset(division[1])))
 
     def get_rects(self) -> Tuple[Rect, Rect]:
         """Returns the two rectangles corresponding to the bounding boxes of each group in the distribution."""
-        r1 = union_all([e.rect for e in self.division[0]])
-        r2 = union_all([e.rect for e in self.division[1]])
-        return r1, r2
+        return self.rects
 
     def __eq__(self, other):
         if isinstance(other, self.__class__):
-            return (self.set1 == other.set1 and self.set2 == other.set2) \
-                   or (self.set1 == other.set2 and self.set2 == other.set1)
+            return self._hash == other._hash and self._key == other._key
         return False
 
     def __ne__(self, other):
         return not self == other
 
     def __hash__(self):
-        return hash(frozenset([frozenset(self.set1), frozenset(self.set2)]))
+        return self._hash
 
     def __repr__(self):
         return f'RStarDistribution({[e.data for e in self.set1]}, {[e.data for e in self.set2]})'
@@ -17,14 +17,14 @@ def get_loc_intersection_fn(loc: Location):
     if isinstance(loc, Point):
         return partial(point_intersects_rect, loc)
     if isinstance(loc, Rect):
-        return partial(rect_intersects_rect, loc)
+        return loc.intersects
     if isinstance(loc, (list, tuple)):
         if len(loc) == 2:
             point = Point(loc[0], loc[1])
             return partial(point_intersects_rect, point)
         if len(loc) == 4:
             rect = Rect(loc[0], loc[1], loc[2], loc[3])
-            return partial(rect_intersects_rect, rect)
+            return rect.intersects
         raise TypeError(f"Invalid number of coordinates in location: {len(loc)}. Location must have either 2 "
                         f"coordinates for a Point, or 4 coordinates for a Rect.")
     raise TypeError(f"Invalid location type: {type(loc)}. Location must either be a Point, Rect, list or tuple.")
@@ -2,6 +2,15 @@ from typing import List, Optional
 
 
 class Rect:
+    """
+    Axis-aligned rectangle defined by its minimum and maximum x and y coordinates. Two rectangles are equal if all four
+    of their coordinates are equal. Rectangles are hashable, so they can be stored in sets or used as dictionary keys.
+    Since the hash is computed from the coordinates, a rectangle must not be modified once it has been hashed (e.g.,
+    after adding it to a set or using it as a dictionary key), or lookups for it will silently fail.
+    """
+
+    __slots__ = ('min_x', 'min_y', 'max_x', 'max_y')
+
     def __init__(self, min_x: float, min_y: float, max_x: float, max_y: float):
         self.min_x = min_x
         self.min_y = min_y
@@ -9,13 +18,16 @@ class Rect:
         self.max_y = max_y
 
     def __eq__(self, other):
+        # Compare the coordinates directly rather than as tuples, which avoids allocating two tuples on every
+        # comparison (and stops at the first coordinate that differs).
         if isinstance(other, Rect):
-            return self.min_x == other.min_x\
-                   and self.min_y == other.min_y\
-                   and self.max_x == other.max_x\
-                   and self.max_y == other.max_y
+            return self.min_x == other.min_x and self.min_y == other.min_y \
+                and self.max_x == other.max_x and self.max_y == other.max_y
         return False
 
+    def __hash__(self):
+        return hash((self.min_x, self.min_y, self.max_x, self.max_y))
+
     def __repr__(self):
         return f'Rect({self.min_x}, {self.min_y}, {self.max_x}, {self.max_y})'
 
@@ -39,11 +51,13 @@ class Rect:
 
     def intersects(self, rect: 'Rect') -> bool:
         a, b = self, rect
-        x1 = max(min(a.min_x, a.max_x), min(b.min_x, b.max_x))
-        y1 = max(min(a.min_y, a.max_y), min(b.min_y, b.max_y))
-        x2 = min(max(a.min_x, a.max_x), max(b.min_x, b.max_x))
-        y2 = min(max(a.min_y, a.max_y), max(b.min_y, b.max_y))
-        return x1 < x2 and y1 < y2
+        return max(min(a.min_x, a.max_x), min(b.min_x, b.max_x)) < min(max(a.min_x, a.max_x), max(b.min_x, b.max_x)) \
+            and max(min(a.min_y, a.max_y), min(b.min_y, b.max_y)) < min(max(a.min_y, a.max_y), max(b.min_y, b.max_y))
+
+    def get_union_area(self, rect: 'Rect') -> float:
+        width = max(self.max_x, rect.max_x) - min(self.min_x, rect.min_x)
+        height = max(self.max_y, rect.max_y) - min(self.min_y, rect.min_y)
+        return width * height
 
     def get_intersection_area(self, rect: 'Rect') -> float:
         x_overlap = max(0.0, min(self.max_x, rect.max_x) - max(self.min_x, rect.min_x))
@@ -58,11 +72,13 @@ class Rect:
     def height(self):
         return self.max_y - self.min_y
 
+    # perimeter and area are used heavily by the split and insert strategies, so they read the coordinates directly
+    # rather than going through the width and height properties.
     def perimeter(self) -> float:
-        return 2 * (self.width + self.height)
+        return 2 * ((self.max_x - self.min_x) + (self.max_y - self.min_y))
 
     def area(self) -> float:
-        return self.width * self.height
+        return (self.max_x - self.min_x) * (self.max_y - self.min_y)
 
     def centroid(self) -> (float, float):
         cx = (self.min_x + self.max_x) / 2
@@ -79,7 +95,20 @@ def union(rect1: Rect, rect2: Rect) -> Rect:
 
 
 def union_all(rects: List[Rect]) -> Rect:
-    result = None
+    # Track the bounds as plain floats and only create a single Rect at the end, rather than allocating an intermediate
+    # Rect for every pairwise union.
+    rects = [rect for rect in rects if rect is not None]
+    if not rects:
+        return None
+    first = rects[0]
+    min_x, min_y, max_x, max_y = first.min_x, first.min_y, first.max_x, first.max_y
     for rect in rects:
-        result = union(result, rect)
-    return result
+        if rect.min_x < min_x:
+            min_x = rect.min_x
+        if rect.min_y < min_y:
+            min_y = rect.min_y
+        if rect.max_x > max_x:
+            max_x = rect.max_x
+        if rect.max_y > max_y:
+            max_y = rect.max_y
+    return Rect(min_x, min_y, max_x, max_y)
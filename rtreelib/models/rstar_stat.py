@@ -1,8 +1,9 @@
-from typing import List, Dict
+from typing import List, Dict, Optional, Tuple, FrozenSet
 from .axis import Axis
 from .dimension import Dimension
 from .entry_distribution import EntryDistribution
-from ..rtree import EntryDivision
+from .rect import Rect
+from ..rtree import RTreeEntry, EntryDivision
 
 
 class RStarStat:
@@ -29,29 +30,38 @@ class RStarStat:
             }
         }
         self.unique_distributions: List[EntryDistribution] = []
+        # Index of the unique distributions by their canonical form, used to find an existing equivalent distribution
+        # without comparing against every unique distribution.
+        self._distributions_by_key: Dict[FrozenSet[FrozenSet[RTreeEntry]], EntryDistribution] = {}
+        # Total perimeter of all distributions along each axis, accumulated as distributions are added.
+        self._axis_perimeters: Dict[Axis, float] = {'x': 0, 'y': 0}
 
-    def add_distribution(self, axis: Axis, dimension: Dimension, division: EntryDivision):
+    def add_distribution(self, axis: Axis, dimension: Dimension, division: EntryDivision,
+                         rects: Optional[Tuple[Rect, Rect]] = None):
         """
         Adds a distribution of entries for the given axis and dimension.
         :param axis: Axis ('x' or 'y')
         :param dimension: Dimension ('min' or 'max')
         :param division: Entry division
+        :param rects: Optional bounding rectangles of the two groups in the division, if already known. If not given,
+            they are computed from the entries when a new distribution is created.
         """
-        distribution = next((d for d in self.unique_distributions if d.is_division_equivalent(division)), None)
+        key = EntryDistribution.get_key(division)
+        distribution = self._distributions_by_key.get(key, None)
         if distribution is None:
-            distribution = EntryDistribution(division)
+            distribution = EntryDistribution(division, rects, key)
+            self._distributions_by_key[key] = distribution
             self.unique_distributions.append(distribution)
         self.stat[axis][dimension].append(distribution)
+        self._axis_perimeters[axis] += distribution.perimeter
 
-    def get_axis_perimeter(self, axis: Axis):
+    def get_axis_perimeter(self, axis: Axis) -> float:
         """
         Returns the total overall perimeter of all distributions along the given axis (sorted by both min and max).
         :param axis: Axis ('x' or 'y')
         :return: Total overall perimeter for all distributions along the axis
         """
-        distributions_min = self.stat[axis]['min']
-        distributions_max = self.stat[axis]['max']
-        return sum([d.perimeter for d in (distributions_min + distributions_max)])
+        return self._axis_perimeters[axis]
 
     def get_axis_unique_distributions(self, axis: Axis) -> List[EntryDistribution]:
         """
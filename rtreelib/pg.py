@@ -199,6 +199,8 @@ def _insert_rtree(cursor, schema, tree: RTreeBase) -> int:
 def _insert_rtree_node(cursor, schema: str, node: RTreeNode, rtree_id: int, level: int, srid: int,
                        node_ids: Dict[RTreeNode, int], entry_ids: Dict[RTreeEntry, int]) -> int:
     rect = node.get_bounding_rect()
+    # Looking up the parent entry requires scanning the entries of the parent node, so only do it once.
+    parent_entry = node.parent_entry
     sql = _get_sql_from_template('insert_rtree_node', schema=schema)
     cursor.execute(sql, {
         "obj_id": id(node),
@@ -210,7 +212,7 @@ def _insert_rtree_node(cursor, schema: str, node: RTreeNode, rtree_id: int, leve
         "max_x": rect.max_x,
         "max_y": rect.max_y,
         "srid": srid,
-        "parent_entry_id": entry_ids[node.parent_entry] if node.parent_entry is not None else None,
+        "parent_entry_id": entry_ids[parent_entry] if parent_entry is not None else None,
         "leaf": node.is_leaf
     })
     node_id = cursor.fetchone()['id']
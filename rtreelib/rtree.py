@@ -1,4 +1,5 @@
 import math
+from collections import deque
 from functools import partial
 from typing import TypeVar, Generic, List, Iterable, Callable, Optional, Tuple, Any
 from rtreelib.models import Rect, get_loc_intersection_fn, Location, union_all
@@ -15,6 +16,8 @@ class RTreeEntry(Generic[T]):
     this is a leaf entry).
     """
 
+    __slots__ = ('rect', 'child', 'data')
+
     def __init__(self, rect: Rect, child: 'RTreeNode[T]' = None, data: T = None):
         self.rect = rect
         self.child = child
@@ -40,6 +43,8 @@ class RTreeNode(Generic[T]):
     otherwise, if it is a non-leaf node, then its entries contain pointers to children nodes.
     """
 
+    __slots__ = ('_tree', '_is_leaf', 'parent', 'entries')
+
     def __init__(self, tree: 'RTreeBase[T]', is_leaf: bool, parent: 'RTreeNode[T]' = None,
                  entries: List[RTreeEntry[T]] = None):
         self._tree = tree
@@ -130,10 +135,21 @@ class RTreeBase(Generic[T]):
         :return: Iterable of leaf entries that matched the location query.
         """
         intersects = get_loc_intersection_fn(loc)
-        for leaf in self.search_nodes(lambda node: intersects(node.get_bounding_rect())):
-            for e in leaf.entries:
+        # Only the bounding rectangle of the root node is computed here. For every other node, the rectangle of the
+        # entry pointing to it is checked instead, since it is kept equal to the node's bounding rectangle. This avoids
+        # recomputing the bounding rectangle of each visited node from all of its entries.
+        if self.root.entries and intersects(self.root.get_bounding_rect()):
+            yield from self._query_node(self.root, intersects)
+
+    def _query_node(self, node: RTreeNode[T], intersects: Callable[[Rect], bool]) -> Iterable[RTreeEntry[T]]:
+        if node.is_leaf:
+            for e in node.entries:
                 if intersects(e.rect):
                     yield e
+        else:
+            for e in node.entries:
+                if intersects(e.rect):
+                    yield from self._query_node(e.child, intersects)
 
     def query_nodes(self, loc: Location, leaves=True) -> Iterable[RTreeNode[T]]:
         """
@@ -145,7 +161,22 @@ class RTreeBase(Generic[T]):
         :param leaves: Indicates whether only leaf-level nodes should be returned. Optional (defaults to True).
         :return: Iterable of nodes that matched the location query.
         """
-        yield from self.search_nodes(_node_intersects(loc), leaves)
+        intersects = get_loc_intersection_fn(loc)
+        # As in query, the rectangle of the entry pointing to each child node is checked instead of recomputing the
+        # bounding rectangle of the child node from all of its entries.
+        if self.root.entries and intersects(self.root.get_bounding_rect()):
+            yield from self._query_nodes(self.root, intersects, leaves)
+
+    def _query_nodes(self, node: RTreeNode[T], intersects: Callable[[Rect], bool], leaves: bool)\
+            -> Iterable[RTreeNode[T]]:
+        if node.is_leaf:
+            yield node
+            return
+        if not leaves:
+            yield node
+        for e in node.entries:
+            if intersects(e.rect):
+                yield from self._query_nodes(e.child, intersects, leaves)
 
     def search(self,
                node_condition: Optional[Callable[[RTreeNode[T]], bool]],
@@ -216,6 +247,25 @@ class RTreeBase(Generic[T]):
             node.parent = self.root
         return self.root
 
+    def bulk_load(self, items: Iterable[Tuple[T, Rect]]) -> List[RTreeEntry[T]]:
+        """
+        Loads many entries at once using the Sort-Tile-Recursive (STR) packing algorithm, which builds the tree from the
+        bottom up rather than inserting each entry individually. This is much faster than repeated inserts, and
+        generally results in nodes that are more fully packed and have less overlap. Any entries already in the tree are
+        packed together with the new entries, so the tree is rebuilt from scratch.
+        :param items: Iterable of (data, rect) tuples for the entries being loaded.
+        :return: List of RTreeEntry instances for the newly-loaded entries, in the same order as the items.
+        """
+        new_entries = [RTreeEntry(rect, data=data) for data, rect in items]
+        entries = list(self.get_leaf_entries()) + new_entries
+        nodes = _str_pack(self, entries, True)
+        while len(nodes) > 1:
+            nodes = _str_pack(self, [RTreeEntry(node.get_bounding_rect(), child=node) for node in nodes], False)
+        self.root = nodes[0] if nodes else RTreeNode(self, True)
+        self.root.parent = None
+        self._cache = None
+        return new_entries
+
     def traverse(self, fn: Callable[[RTreeNode[T]], Iterable[TResult]],
                  condition: Optional[Callable[[RTreeNode[T]], bool]] = None) -> Iterable[TResult]:
         """
@@ -262,14 +312,13 @@ class RTreeBase(Generic[T]):
             node and a level parameter. If condition returns False, then neither the node nor any of its descendants
             will be traversed. If not passed in, all nodes will be traversed.
         """
-        stack = [(self.root, 0)]
-        while stack:
-            node, level = stack[0]
-            stack = stack[1:]
+        queue = deque([(self.root, 0)])
+        while queue:
+            node, level = queue.popleft()
             if condition is None or condition(node, level):
                 yield from fn(node, level)
                 if not node.is_leaf:
-                    stack.extend([(entry.child, level + 1) for entry in node.entries])
+                    queue.extend((entry.child, level + 1) for entry in node.entries)
 
     def get_levels(self) -> List[List[RTreeNode[T]]]:
         """
@@ -282,6 +331,19 @@ class RTreeBase(Generic[T]):
         list(self.traverse_level_order(fn))
         return levels
 
+    @property
+    def height(self) -> int:
+        """
+        Returns the number of levels in the R-Tree. Since all leaf nodes are at the same level, this only requires
+        descending a single path from the root to a leaf, rather than traversing the entire tree as get_levels does.
+        """
+        height = 1
+        node = self.root
+        while not node.is_leaf:
+            node = node.entries[0].child
+            height += 1
+        return height
+
     def get_nodes(self) -> Iterable[RTreeNode[T]]:
         """Returns an iterable of all nodes in the R-Tree (including intermediate and leaf nodes)"""
         return self._get_nodes(self.root)
@@ -307,6 +369,51 @@ class RTreeBase(Generic[T]):
                 yield entry
 
 
+def _str_pack(tree: RTreeBase[T], entries: List[RTreeEntry[T]], is_leaf: bool) -> List[RTreeNode[T]]:
+    """
+    Packs a list of entries into a single level of nodes using Sort-Tile-Recursive (STR). The entries are sorted by the
+    x-coordinate of their center and cut into vertical slabs of roughly sqrt(P) nodes each (where P is the number of
+    nodes needed), then each slab is sorted by the y-coordinate of the center and cut into nodes. Entries are spread
+    evenly across the nodes (rather than filling each node to capacity and leaving a small remainder in the last one),
+    so that no node is left with fewer than min_entries entries.
+    """
+    if not entries:
+        return []
+    num_nodes = math.ceil(len(entries) / tree.max_entries)
+    nodes_per_slab = math.ceil(num_nodes / math.ceil(math.sqrt(num_nodes)))
+    node_sizes = _even_sizes(len(entries), num_nodes)
+    entries = sorted(entries, key=_center_x)
+    nodes = []
+    start = 0
+    for i in range(0, num_nodes, nodes_per_slab):
+        slab_sizes = node_sizes[i:(i + nodes_per_slab)]
+        end = start + sum(slab_sizes)
+        slab = sorted(entries[start:end], key=_center_y)
+        start = end
+        j = 0
+        for size in slab_sizes:
+            node = RTreeNode(tree, is_leaf, entries=slab[j:(j + size)])
+            tree._fix_children(node)
+            nodes.append(node)
+            j += size
+    return nodes
+
+
+def _even_sizes(total: int, parts: int) -> List[int]:
+    """Divides a total into the given number of parts, such that the sizes of the parts differ by at most 1."""
+    q, r = divmod(total, parts)
+    return [q + 1] * r + [q] * (parts - r)
+
+
+# Sort keys used by STR. These return twice the center coordinate, which sorts the same as the center itself.
+def _center_x(entry: RTreeEntry[T]) -> float:
+    return entry.rect.min_x + entry.rect.max_x
+
+
+def _center_y(entry: RTreeEntry[T]) -> float:
+    return entry.rect.min_y + entry.rect.max_y
+
+
 def _add_node_to_level(levels: List[List[RTreeNode[T]]], node: RTreeNode[T], level: int) -> Iterable[None]:
     if level >= len(levels):
         nodelist = []
@@ -329,8 +436,3 @@ def _yield_if_leaf(node: RTreeNode[T]) -> Iterable[RTreeNode[T]]:
 def _yield_if_leaf_with_lvl_param(node: RTreeNode[T], _) -> Iterable[RTreeNode[T]]:
     if node.is_leaf:
         yield node
-
-
-def _node_intersects(loc: Location) -> Callable[[RTreeNode[T]], bool]:
-    loc_intersects = get_loc_intersection_fn(loc)
-    return lambda node: loc_intersects(node.get_bounding_rect())
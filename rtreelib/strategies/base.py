@@ -40,7 +40,7 @@ def least_area_enlargement(entries: List[RTreeEntry[T]], rect: Rect) -> RTreeEnt
     overlap enlargement instead of least area enlargement).
     """
     areas = [child.rect.area() for child in entries]
-    enlargements = [rect.union(child.rect).area() - areas[i] for i, child in enumerate(entries)]
+    enlargements = [rect.get_union_area(child.rect) - areas[i] for i, child in enumerate(entries)]
     min_enlargement = min(enlargements)
     indices = [i for i, v in enumerate(enlargements) if math.isclose(v, min_enlargement, rel_tol=EPSILON)]
     # If a single entry is a clear winner, choose that entry. Otherwise, if there are multiple entries having the
@@ -97,8 +97,7 @@ def _pick_seeds(entries: List[RTreeEntry[T]]) -> (RTreeEntry[T], RTreeEntry[T]):
     seeds = None
     max_wasted_area = None
     for e1, e2 in itertools.combinations(entries, 2):
-        combined_rect = e1.rect.union(e2.rect)
-        wasted_area = combined_rect.area() - e1.rect.area() - e2.rect.area()
+        wasted_area = e1.rect.get_union_area(e2.rect) - e1.rect.area() - e2.rect.area()
         if max_wasted_area is None or wasted_area > max_wasted_area:
             max_wasted_area = wasted_area
             seeds = (e1, e2)
@@ -113,8 +112,8 @@ def _pick_next(remaining_entries: List[RTreeEntry[T]],
     max_diff = None
     result = None
     for e in remaining_entries:
-        d1 = group1_rect.union(e.rect).area() - group1_area
-        d2 = group2_rect.union(e.rect).area() - group2_area
+        d1 = group1_rect.get_union_area(e.rect) - group1_area
+        d2 = group2_rect.get_union_area(e.rect) - group2_area
         diff = math.fabs(d1 - d2)
         if max_diff is None or diff > max_diff:
             max_diff = diff
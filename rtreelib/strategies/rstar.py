@@ -3,8 +3,10 @@ R*-Tree implementation, as described in this paper:
 https://infolab.usc.edu/csci599/Fall2001/paper/rstar-tree.pdf
 """
 
+import heapq
 import math
-from typing import List, TypeVar, Iterable, Callable, Any, Dict, Optional
+from operator import attrgetter
+from typing import List, TypeVar, Iterable, Callable, Any, Dict, Optional, Tuple
 from ..rtree import RTreeBase, RTreeEntry, RTreeNode, DEFAULT_MAX_ENTRIES, EPSILON, EntryDivision, EntryOrdering
 from rtreelib.models import Rect, Axis, Dimension, EntryDistribution, RStarStat, RStarCache, union_all
 from .base import insert, least_area_enlargement, adjust_tree_strategy
@@ -44,34 +46,55 @@ def rstar_adjust_tree(tree: RTreeBase[T], node: RTreeNode[T], split_node: RTreeN
 def rstar_overflow(tree: RTreeBase[T], node: RTreeNode[T]) -> RTreeNode[T]:
     """
     R* overflow treatment. The outer method initializes a cache to store information about the tree's current state,
-    including the current state of the nodes at every level of the tree, as well as a dictionary of which levels we
-    have performed a force reinsert on.
+    including the current state of the nodes at every level of the tree (populated only once a forced reinsert needs
+    it), as well as a dictionary of which levels we have performed a force reinsert on.
     :param tree: R-tree instance
     :param node: Overflowing node
     :return: New node resulting from a split, or None
     """
     if not tree._cache:
         tree._cache = RStarCache()
-    if not tree._cache.levels:
-        tree._cache.levels = tree.get_levels()
-    levels_from_leaf = _get_levels_from_leaf(tree._cache.levels, node)
+    levels_from_leaf = _get_levels_from_leaf(node)
     return _rstar_overflow(tree, node, levels_from_leaf)
 
 
-def _get_levels_from_leaf(levels: List[List[RTreeNode[T]]], node: RTreeNode[T]) -> int:
-    return len(levels) - next((i for i, level in enumerate(levels) if node in level)) - 1
+def _get_levels_from_leaf(node: RTreeNode[T]) -> int:
+    # All leaf nodes are at the same level, so it is enough to descend along any single path to reach the leaf level.
+    levels_from_leaf = 0
+    while not node.is_leaf:
+        node = node.entries[0].child
+        levels_from_leaf += 1
+    return levels_from_leaf
 
 
 # noinspection PyProtectedMember
 def _rstar_overflow(tree: RTreeBase[T], node: RTreeNode[T], levels_from_leaf: int) -> Optional[RTreeNode[T]]:
-    # If the level is not the root level and this is the first call of _rstar_overflow on the given level, then
-    # perform a forced reinsert of a subset of the entries in the node. Otherwise, do a regular node split.
-    if node.is_root or tree._cache.reinsert.get(levels_from_leaf, False):
+    # Splits that cause the parent to overflow are propagated upward in this loop, one level per iteration, rather than
+    # by having adjust_tree call back into the overflow strategy for the parent (which would nest a call to
+    # adjust_tree for every level the split propagates through).
+    propagated = False
+    while True:
+        # If the level is not the root level and this is the first overflow on the given level, then perform a forced
+        # reinsert of a subset of the entries in the node. Otherwise, do a regular node split.
+        if not node.is_root and not tree._cache.reinsert.get(levels_from_leaf, False):
+            reinsert(tree, node, levels_from_leaf)
+            if propagated:
+                tree.adjust_tree(tree, node)
+            return None
         split_node = rstar_split(tree, node)
-        tree.adjust_tree(tree, node, split_node)
-    else:
-        reinsert(tree, node, levels_from_leaf)
-    return None
+        parent = node.parent
+        if parent is None or len(parent.entries) < tree.max_entries:
+            # Either the tree grows a level, or the parent has room for the split node. In both cases, adjust_tree
+            # takes care of the rest without causing any further overflow.
+            tree.adjust_tree(tree, node, split_node)
+            return None
+        # The parent will overflow once the split node is added, so add it here and continue with the parent.
+        node.parent_entry.rect = union_all([entry.rect for entry in node.entries])
+        parent.entries.append(RTreeEntry(union_all([e.rect for e in split_node.entries]), child=split_node))
+        tree._cache.levels = None
+        node = parent
+        levels_from_leaf += 1
+        propagated = True
 
 
 # noinspection PyProtectedMember
@@ -90,17 +113,19 @@ def reinsert(tree: RTreeBase[T], node: RTreeNode[T], levels_from_leaf: int):
     # level during an insert operation.
     tree._cache.reinsert[levels_from_leaf] = True
 
-    # Sort the entries in order of increasing distance from the node's centroid
+    # Get the subset of entries to reinsert, in order of increasing distance from the node's centroid. Per the paper,
+    # reinserting the closest 30% yields the best performance. Only these entries need to be ordered, so a bounded heap
+    # is used rather than sorting all the entries. Only the relative order matters, so the squared distance is used to
+    # avoid taking a square root for every entry.
     node_centroid = node.get_bounding_rect().centroid()
-    sorted_entries = sorted(node.entries, key=lambda e: _dist(e.rect.centroid(), node_centroid))
-
-    # Get the subset of entries to reinsert. Per the paper, reinserting the closest 30% yields the best performance.
-    p = math.ceil(0.3 * len(sorted_entries))
-    entries_to_reinsert = sorted_entries[:p]
+    p = math.ceil(0.3 * len(node.entries))
+    entries_to_reinsert = heapq.nsmallest(p, node.entries,
+                                          key=lambda e: _dist_squared(e.rect.centroid(), node_centroid))
 
     # Remove entries that will be reinserted from the node and adjust the node's bounding rectangle to
     # fit the remaining entries.
-    node.entries = [e for e in node.entries if e not in entries_to_reinsert]
+    reinsert_set = set(entries_to_reinsert)
+    node.entries = [e for e in node.entries if e not in reinsert_set]
     node.parent_entry.rect = union_all([entry.rect for entry in node.entries])
 
     # Reinsert the entries at the same level in the tree.
@@ -108,10 +133,12 @@ def reinsert(tree: RTreeBase[T], node: RTreeNode[T], levels_from_leaf: int):
         _reinsert_entry(tree, e, levels_from_leaf)
 
 
-def _dist(p1, p2):
+def _dist_squared(p1, p2):
     x1, y1 = p1
     x2, y2 = p2
-    return math.sqrt((x2-x1)**2 + (y2-y1)**2)
+    dx = x2 - x1
+    dy = y2 - y1
+    return dx*dx + dy*dy
 
 
 # noinspection PyProtectedMember
@@ -119,6 +146,12 @@ def _reinsert_entry(tree: RTreeBase[T], entry: RTreeEntry[T], levels_from_leaf:
     node = _choose_subtree_reinsert(tree, entry.rect, levels_from_leaf)
     node.entries.append(entry)
     tree._fix_children(node)
+    # The levels cache may have been populated while this entry's subtree was detached from the tree (after reinsert
+    # removed it from the overflowing node), in which case the nodes of the subtree are missing from the cache. Now
+    # that the subtree is attached again, invalidate the cache so that later reinserts at lower levels can choose these
+    # nodes.
+    if not entry.is_leaf:
+        tree._cache.levels = None
     split_node = None
     if len(node.entries) > tree.max_entries:
         split_node = rstar_split(tree, node)
@@ -139,8 +172,11 @@ def _choose_subtree_reinsert(tree: RTreeBase[T], rect: Rect, levels_from_leaf: i
         tree._cache.levels = tree.get_levels()
     is_leaf_level = levels_from_leaf == 0
     depth = len(tree._cache.levels)
-    nodes = tree._cache.levels[depth - levels_from_leaf - 1]
-    entries = [node.parent_entry for node in nodes]
+    # The candidates are the parent entries of every node at the target level. Rather than looking up the parent entry
+    # of each node (which requires scanning the entries of its parent), gather the entries of all nodes in the level
+    # above, which yields the same entries in the same order.
+    parents = tree._cache.levels[depth - levels_from_leaf - 2]
+    entries = [entry for parent in parents for entry in parent.entries]
     if is_leaf_level:
         e = least_overlap_enlargement(entries, rect)
     else:
@@ -160,21 +196,15 @@ def rstar_choose_leaf(tree: RTreeBase[T], entry: RTreeEntry[T]) -> RTreeNode[T]:
         defined by split_node.
     """
     node = tree.root
-    while not node.is_leaf:
-        if _are_children_leaves(node):
-            e = least_overlap_enlargement(node.entries, entry.rect)
-        else:
-            e = least_area_enlargement(node.entries, entry.rect)
-        node = e.child
-    return node
-
-
-def _are_children_leaves(node: RTreeNode[T]) -> bool:
-    for entry in node.entries:
-        if entry.child is not None:
-            if entry.child.is_leaf:
-                return True
-    return False
+    if node.is_leaf:
+        return node
+    # All leaf nodes are at the same level, so the number of levels to descend is the same along every path. Only the
+    # last step (choosing among the parents of the leaf nodes) uses least overlap enlargement.
+    levels_from_leaf = _get_levels_from_leaf(node)
+    while levels_from_leaf > 1:
+        node = least_area_enlargement(node.entries, entry.rect).child
+        levels_from_leaf -= 1
+    return least_overlap_enlargement(node.entries, entry.rect).child
 
 
 def least_overlap_enlargement(entries: List[RTreeEntry[T]], rect: Rect) -> RTreeEntry[T]:
@@ -185,9 +215,12 @@ def least_overlap_enlargement(entries: List[RTreeEntry[T]], rect: Rect) -> RTree
     :return: Returns the entry from 'entries' whose bounding rectangle results in least overlap enlargement if it is
         expanded to accommodate 'rect'. In case of tie, this strategy falls back to least area enlargement.
     """
-    overlaps = [overlap(e.rect, [e2.rect for e2 in without(entries, e)]) for e in entries]
-    overlap_enlargements = [overlap(e.rect.union(rect), [e2.rect for e2 in without(entries, e)]) - overlaps[i]
-                            for i, e in enumerate(entries)]
+    # The coordinates of each rectangle are unpacked into a tuple once up front, since the overlap of every pair of
+    # rectangles is computed below and attribute lookups would otherwise dominate the cost.
+    rects = [e.rect for e in entries]
+    coords = [(r.min_x, r.min_y, r.max_x, r.max_y) for r in rects]
+    target = (rect.min_x, rect.min_y, rect.max_x, rect.max_y)
+    overlap_enlargements = [_overlap_enlargement(coords, i, target) for i in range(len(coords))]
     min_enlargement = min(overlap_enlargements)
     indices = [i for i, v in enumerate(overlap_enlargements) if math.isclose(v, min_enlargement, rel_tol=EPSILON)]
     # If a single entry is a clear winner, choose that entry.
@@ -199,6 +232,45 @@ def least_overlap_enlargement(entries: List[RTreeEntry[T]], rect: Rect) -> RTree
         return least_area_enlargement(entries, rect)
 
 
+def _overlap_enlargement(coords: List[Tuple[float, float, float, float]], i: int,
+                         rect: Tuple[float, float, float, float]) -> float:
+    # Returns how much the total overlap of rectangle i with the other rectangles grows if rectangle i is expanded to
+    # accommodate 'rect'. Rectangles are given as (min_x, min_y, max_x, max_y) tuples. This is equivalent to:
+    #     overlap(rects[i].union(rect), others) - overlap(rects[i], others)
+    # but computes both sums in a single pass over the other rectangles, without building the list of other rectangles
+    # or the union rectangle.
+    min_x, min_y, max_x, max_y = coords[i]
+    r_min_x, r_min_y, r_max_x, r_max_y = rect
+    # If the rectangle already contains 'rect', it does not need to be expanded, so its overlap cannot change.
+    if min_x <= r_min_x and min_y <= r_min_y and max_x >= r_max_x and max_y >= r_max_y:
+        return 0
+    u_min_x, u_min_y = min(min_x, r_min_x), min(min_y, r_min_y)
+    u_max_x, u_max_y = max(max_x, r_max_x), max(max_y, r_max_y)
+    before = 0
+    after = 0
+    # The comparisons below are written out as conditional expressions rather than calls to the min() and max()
+    # builtins, since the function call overhead of the builtins dominates this loop. Only positive overlaps are added
+    # to the totals. Since the enlarged rectangle contains the original one, the original rectangle can only overlap
+    # another rectangle if the enlarged one does.
+    for j, (o_min_x, o_min_y, o_max_x, o_max_y) in enumerate(coords):
+        if j == i:
+            continue
+        dx = (u_max_x if u_max_x < o_max_x else o_max_x) - (u_min_x if u_min_x > o_min_x else o_min_x)
+        if dx <= 0:
+            continue
+        dy = (u_max_y if u_max_y < o_max_y else o_max_y) - (u_min_y if u_min_y > o_min_y else o_min_y)
+        if dy <= 0:
+            continue
+        after += dx * dy
+        dx = (max_x if max_x < o_max_x else o_max_x) - (min_x if min_x > o_min_x else o_min_x)
+        if dx <= 0:
+            continue
+        dy = (max_y if max_y < o_max_y else o_max_y) - (min_y if min_y > o_min_y else o_min_y)
+        if dy > 0:
+            before += dx * dy
+    return after - before
+
+
 def without(items: List[T], item: T) -> List[T]:
     """Returns all items in a list except the given item."""
     return [i for i in items if i != item]
@@ -223,29 +295,62 @@ def get_rstar_stat(entries: List[RTreeEntry[T]], min_entries: int, max_entries:
     :param max_entries: Maximum number of entries per node
     :return: Cached statistics for this list of entries
     """
-    sort_divisions: Dict[EntryOrdering, List[EntryDivision]] = {}
+    sort_divisions: Dict[EntryOrdering, List[Tuple[EntryDivision, Tuple[Rect, Rect]]]] = {}
     stat = RStarStat()
-    for axis in ['x', 'y']:
-        for dimension in ['min', 'max']:
-            sorted_entries = tuple(sorted(entries, key=_get_sort_key(axis, dimension)))
-            divisions = sort_divisions.get(sorted_entries, None)
-            if divisions is None:
-                divisions = get_possible_divisions(sorted_entries, min_entries, max_entries)
-                sort_divisions[sorted_entries] = divisions
-            for division in divisions:
-                stat.add_distribution(axis, dimension, division)
+    for axis, dimension, sort_key in _SORT_KEYS:
+        sorted_entries = tuple(sorted(entries, key=sort_key))
+        divisions = sort_divisions.get(sorted_entries, None)
+        if divisions is None:
+            divisions = get_possible_divisions(sorted_entries, min_entries, max_entries)
+            division_rects = _get_division_rects(sorted_entries, min_entries, max_entries)
+            divisions = list(zip(divisions, division_rects))
+            sort_divisions[sorted_entries] = divisions
+        for division, rects in divisions:
+            stat.add_distribution(axis, dimension, division, rects)
     return stat
 
 
-def _get_sort_key(axis: Axis, dimension: Dimension) -> Callable[[RTreeEntry[T]], Any]:
-    if axis == 'x' and dimension == 'min':
-        return lambda e: e.rect.min_x
-    if axis == 'x' and dimension == 'max':
-        return lambda e: e.rect.max_x
-    if axis == 'y' and dimension == 'min':
-        return lambda e: e.rect.min_y
-    if axis == 'y' and dimension == 'max':
-        return lambda e: e.rect.max_y
+def _get_division_rects(entries: EntryOrdering, min_entries: int, max_entries: int) -> List[Tuple[Rect, Rect]]:
+    # Returns the bounding rectangles of both groups for each division returned by get_possible_divisions. Rather than
+    # computing the bounding rectangle of every group from scratch, the bounding rectangles of the groups are collected
+    # during a single running scan over the entries in each direction.
+    n = len(entries)
+    split_indices = _get_split_indices(min_entries, max_entries)
+    first_rects = _get_running_rects(entries, split_indices[0], split_indices[-1])
+    second_rects = _get_running_rects(entries[::-1], n - split_indices[-1], n - split_indices[0])
+    return list(zip(first_rects, reversed(second_rects)))
+
+
+def _get_running_rects(entries: EntryOrdering, min_length: int, max_length: int) -> List[Rect]:
+    # Returns the bounding rectangles of the first k entries, for each k from min_length to max_length. The bounds are
+    # tracked as plain floats, and a Rect is only created for the prefixes that are returned.
+    rects = []
+    first = entries[0].rect
+    min_x, min_y, max_x, max_y = first.min_x, first.min_y, first.max_x, first.max_y
+    for k in range(1, max_length + 1):
+        r = entries[k - 1].rect
+        if r.min_x < min_x:
+            min_x = r.min_x
+        if r.min_y < min_y:
+            min_y = r.min_y
+        if r.max_x > max_x:
+            max_x = r.max_x
+        if r.max_y > max_y:
+            max_y = r.max_y
+        if k >= min_length:
+            rects.append(Rect(min_x, min_y, max_x, max_y))
+    return rects
+
+
+# Sort keys for each of the 4 orderings of the entries considered by the split algorithm (by the minimum and maximum
+# coordinate along each axis). These are defined once here rather than being looked up on every call to get_rstar_stat,
+# and use attrgetter (implemented in C) rather than lambdas to avoid a Python function call per entry.
+_SORT_KEYS: Tuple[Tuple[Axis, Dimension, Callable[[RTreeEntry[T]], Any]], ...] = (
+    ('x', 'min', attrgetter('rect.min_x')),
+    ('x', 'max', attrgetter('rect.max_x')),
+    ('y', 'min', attrgetter('rect.min_y')),
+    ('y', 'max', attrgetter('rect.max_y'))
+)
 
 
 def choose_split_axis(stat: RStarStat) -> Axis:
@@ -271,8 +376,13 @@ def get_possible_divisions(entries: Iterable[RTreeEntry[T]], min_entries: int, m
         after the insertion of a new entry).
     :return: List of tuples representing the possible divisions.
     """
-    m = min_entries
-    return [(entries[:(m-1+k)], entries[(m-1+k):]) for k in range(1, max_entries - 2*m + 3)]
+    return [(entries[:i], entries[i:]) for i in _get_split_indices(min_entries, max_entries)]
+
+
+def _get_split_indices(min_entries: int, max_entries: int) -> range:
+    # Each division splits the entries at a single index, ranging from min_entries (the first group has the minimum
+    # number of entries) to max_entries - min_entries + 1 (the second group has the minimum number of entries).
+    return range(min_entries, max_entries - min_entries + 2)
 
 
 def choose_split_index(distributions: List[EntryDistribution]) -> int:
@@ -281,8 +391,8 @@ def choose_split_index(distributions: List[EntryDistribution]) -> int:
     :param distributions: List of possible distributions of entries along the best split axis.
     :return: Index of the best distribution among the list of possible distributions.
     """
-    division_rects = [d.get_rects() for d in distributions]
-    division_overlaps = [r1.get_intersection_area(r2) for r1, r2 in division_rects]
+    # The overlap of each distribution is already computed when the distribution is created, so it is reused here.
+    division_overlaps = [d.overlap for d in distributions]
     min_overlap = min(division_overlaps)
     indices = [i for i, v in enumerate(division_overlaps) if math.isclose(v, min_overlap, rel_tol=EPSILON)]
     # If a single index is a clear winner, choose that index.
@@ -293,7 +403,7 @@ def choose_split_index(distributions: List[EntryDistribution]) -> int:
         min_area = None
         split_index = None
         for i in indices:
-            r1, r2 = division_rects[i]
+            r1, r2 = distributions[i].get_rects()
             area = r1.area() + r2.area()
             if min_area is None or area < min_area:
                 min_area = area
@@ -3,7 +3,7 @@ from unittest import TestCase
 from unittest.mock import Mock
 from rtreelib import Point, Rect, RTree, RTreeEntry, RTreeNode
 from rtreelib.strategies.base import least_area_enlargement
-from tests.util import create_simple_tree, create_complex_tree
+from tests.util import create_simple_tree, create_complex_tree, check_simple_tree, check_complex_tree
 
 
 # noinspection PyPep8Naming
@@ -98,7 +98,7 @@ class TestCommon(TestCase):
         max_entries)
         """
         # Arrange
-        t = create_simple_tree(self)
+        t = create_simple_tree()
 
         # Act
         entries = list(t.get_leaf_entries())
@@ -112,7 +112,7 @@ class TestCommon(TestCase):
         split)
         """
         # Arrange
-        t = create_simple_tree(self)
+        t = create_simple_tree()
 
         # Act
         rect = t.root.get_bounding_rect()
@@ -120,11 +120,27 @@ class TestCommon(TestCase):
         # Assert
         self.assertEqual(Rect(0, 0, 10, 10), rect)
 
+    def test_create_simple_tree(self):
+        """Ensure the simple tree shared across multiple tests has the expected structure"""
+        # Act
+        t = create_simple_tree()
+
+        # Assert
+        check_simple_tree(self, t)
+
+    def test_create_complex_tree(self):
+        """Ensure the complex tree shared across multiple tests has the expected structure"""
+        # Act
+        t = create_complex_tree()
+
+        # Assert
+        check_complex_tree(self, t)
+
     def test_traverse(self):
         """Tests that a given function is called on every node of the tree when calling traverse"""
         # Arrange
         nodes = dict()
-        t = create_simple_tree(self, nodes)
+        t = create_simple_tree(nodes)
         R, L1, L2 = nodes['R'], nodes['L1'], nodes['L2']
 
         # Act
@@ -152,7 +168,7 @@ class TestCommon(TestCase):
         """
         # Arrange
         nodes = dict()
-        t = create_complex_tree(self, nodes)
+        t = create_complex_tree(nodes)
 
         def condition(node: RTreeNode):
             return node.is_root or node.get_bounding_rect().max_x <= 10
@@ -173,7 +189,7 @@ class TestCommon(TestCase):
         """Tests that nodes are traversed in level-order when calling traverse_level_order"""
         # Arrange
         nodes = dict()
-        t = create_complex_tree(self, nodes)
+        t = create_complex_tree(nodes)
 
         def fn(n: RTreeNode, lvl: int):
             yield (lvl, n)
@@ -217,7 +233,7 @@ class TestCommon(TestCase):
         """Tests traverse_level_order with a condition function."""
         # Arrange
         nodes = dict()
-        t = create_complex_tree(self, nodes)
+        t = create_complex_tree(nodes)
 
         def fn(n: RTreeNode, lvl: int):
             yield (lvl, n)
@@ -275,7 +291,7 @@ class TestCommon(TestCase):
     def test_query_point_no_matches(self):
         """Tests query method with a Point location returning no matches."""
         # Arrange
-        t = create_complex_tree(self)
+        t = create_complex_tree()
         loc = Point(5, 8)
 
         # Act
@@ -284,10 +300,21 @@ class TestCommon(TestCase):
         # Assert
         self.assertEqual(0, len(result))
 
+    def test_query_empty_tree(self):
+        """Tests query method on an empty tree (whose root node has no bounding rectangle)."""
+        # Arrange
+        t = RTree()
+
+        # Act
+        result = list(t.query(Point(0, 0)))
+
+        # Assert
+        self.assertEqual(0, len(result))
+
     def test_query_point_single_match(self):
         """Tests query method with a Point location returning a single match."""
         # Arrange
-        t = create_complex_tree(self)
+        t = create_complex_tree()
         loc = Point(8, 3)
 
         # Act
@@ -300,7 +327,7 @@ class TestCommon(TestCase):
     def test_query_point_multiple_matches(self):
         """Tests query method with a Point location returning multiple matches."""
         # Arrange
-        t = create_complex_tree(self)
+        t = create_complex_tree()
         loc = Point(1.5, 1.5)
 
         # Act
@@ -312,7 +339,7 @@ class TestCommon(TestCase):
     def test_query_point_tuple_single_match(self):
         """Tests query method with a point tuple location returning a single match."""
         # Arrange
-        t = create_complex_tree(self)
+        t = create_complex_tree()
         loc = (8, 3)
 
         # Act
@@ -325,7 +352,7 @@ class TestCommon(TestCase):
     def test_query_point_list_multiple_matches(self):
         """Tests query method with a point location passed in as a list of 2 coordinates returning multiple matches."""
         # Arrange
-        t = create_complex_tree(self)
+        t = create_complex_tree()
         loc = [1.5, 5.5]
 
         # Act
@@ -337,7 +364,7 @@ class TestCommon(TestCase):
     def test_query_point_on_border_matches(self):
         """Ensures that a point that is on the border (but not within) an entry MBR matches."""
         # Arrange
-        t = create_complex_tree(self)
+        t = create_complex_tree()
         loc = Point(4, 4)
 
         # Act
@@ -350,7 +377,7 @@ class TestCommon(TestCase):
     def test_query_rect_no_matches(self):
         """Tests query method with a Rect location returning no matches."""
         # Arrange
-        t = create_complex_tree(self)
+        t = create_complex_tree()
         r = Rect(4, 5, 5, 7)
 
         # Act
@@ -365,7 +392,7 @@ class TestCommon(TestCase):
         entry.
         """
         # Arrange
-        t = create_complex_tree(self)
+        t = create_complex_tree()
         r = Rect(4, 3, 6, 5)
 
         # Act
@@ -381,7 +408,7 @@ class TestCommon(TestCase):
         any of the matched entries.
         """
         # Arrange
-        t = create_complex_tree(self)
+        t = create_complex_tree()
         r = Rect(4, 3, 8, 5)
 
         # Act
@@ -396,7 +423,7 @@ class TestCommon(TestCase):
         Rectangle overlaps but is not equal to any of the matched entries.
         """
         # Arrange
-        t = create_complex_tree(self)
+        t = create_complex_tree()
         r = (0, 6, 2, 8)
 
         # Act
@@ -411,7 +438,7 @@ class TestCommon(TestCase):
         Rectangle overlaps but is not equal to any of the matched entries.
         """
         # Arrange
-        t = create_complex_tree(self)
+        t = create_complex_tree()
         r = [0.5, 6, 2, 7.5]
 
         # Act
@@ -426,7 +453,7 @@ class TestCommon(TestCase):
         entry.
         """
         # Arrange
-        t = create_complex_tree(self)
+        t = create_complex_tree()
         r = Rect(2, 2, 6, 5)
 
         # Act
@@ -442,7 +469,7 @@ class TestCommon(TestCase):
         entry.
         """
         # Arrange
-        t = create_complex_tree(self)
+        t = create_complex_tree()
         r = (2, 2, 6, 4)
 
         # Act
@@ -458,7 +485,7 @@ class TestCommon(TestCase):
         matched entries.
         """
         # Arrange
-        t = create_complex_tree(self)
+        t = create_complex_tree()
         r = [5.5, 6, 12, 13.5]
 
         # Act
@@ -472,7 +499,7 @@ class TestCommon(TestCase):
         Ensures that a query for a rect that is adjacent to but does not intersect with an entry does not match.
         """
         # Arrange
-        t = create_complex_tree(self)
+        t = create_complex_tree()
         r = Rect(5, 0, 9, 2)
 
         # Act
@@ -486,7 +513,7 @@ class TestCommon(TestCase):
         Ensures that a query for a rect that matches the bounding rectangle of the root node returns all entries.
         """
         # Arrange
-        t = create_complex_tree(self)
+        t = create_complex_tree()
 
         # Act
         result = list(t.query(t.root.get_bounding_rect()))
@@ -494,11 +521,22 @@ class TestCommon(TestCase):
         # Assert
         self.assertCountEqual(['a', 'b', 'c', 'd', 'e', 'f', 'g', 'h', 'i', 'j'], [e.data for e in result])
 
+    def test_query_nodes_empty_tree(self):
+        """Tests query_nodes method on an empty tree (whose root node has no bounding rectangle)."""
+        # Arrange
+        t = RTree()
+
+        # Act
+        result = list(t.query_nodes(Point(0, 0), leaves=False))
+
+        # Assert
+        self.assertEqual(0, len(result))
+
     def test_query_nodes_point_single_match(self):
         """Tests query_nodes method with a Point location returning a single match"""
         # Arrange
         nodes = dict()
-        t = create_complex_tree(self, nodes)
+        t = create_complex_tree(nodes)
         loc = Point(8, 1)
 
         # Act
@@ -511,7 +549,7 @@ class TestCommon(TestCase):
         """Tests query_nodes method with a Point location returning no matches"""
         # Arrange
         nodes = dict()
-        t = create_complex_tree(self, nodes)
+        t = create_complex_tree(nodes)
         loc = (5, 6)
 
         # Act
@@ -543,7 +581,7 @@ class TestCommon(TestCase):
         """Tests query_nodes method with a Rect location returning a single match"""
         # Arrange
         nodes = dict()
-        t = create_complex_tree(self, nodes)
+        t = create_complex_tree(nodes)
         loc = Rect(6, 4, 8, 6)
 
         # Act
@@ -556,7 +594,7 @@ class TestCommon(TestCase):
         """Tests query_nodes method with a Rect location returning multiple matches"""
         # Arrange
         nodes = dict()
-        t = create_complex_tree(self, nodes)
+        t = create_complex_tree(nodes)
         L3, L4 = nodes['L3'], nodes['L4']
         loc = (5, 0, 8, 1)
 
@@ -570,7 +608,7 @@ class TestCommon(TestCase):
         """Tests query_nodes method with a Rect location returning no matches"""
         # Arrange
         nodes = dict()
-        t = create_complex_tree(self, nodes)
+        t = create_complex_tree(nodes)
         loc = [4, 5, 6, 10]
 
         # Act
@@ -583,7 +621,7 @@ class TestCommon(TestCase):
         """Tests query_nodes method with leaves=False (returning intermediate nodes), returning multiple matches."""
         # Arrange
         nodes = dict()
-        t = create_complex_tree(self, nodes)
+        t = create_complex_tree(nodes)
         R, I1, L1 = nodes['R'], nodes['I1'], nodes['L1']
         loc = Rect(3, 9, 4, 10)
 
@@ -597,7 +635,7 @@ class TestCommon(TestCase):
         """Tests query_nodes method with leaves=False (returning intermediate nodes), returning a single match."""
         # Arrange
         nodes = dict()
-        t = create_complex_tree(self, nodes)
+        t = create_complex_tree(nodes)
         loc = (11, 10)
 
         # Act
@@ -611,7 +649,7 @@ class TestCommon(TestCase):
         """Tests query_nodes method with leaves=False (returning intermediate nodes), returning no matches"""
         # Arrange
         nodes = dict()
-        t = create_complex_tree(self, nodes)
+        t = create_complex_tree(nodes)
         loc = (12, 12)
 
         # Act
@@ -623,7 +661,7 @@ class TestCommon(TestCase):
     def test_search_with_node_and_entry_conditions(self):
         """Tests search method with both a node and an entry constraint"""
         # Arrange
-        t = create_simple_tree(self)
+        t = create_simple_tree()
 
         def node_condition(node: RTreeNode):
             return node.get_bounding_rect().intersects(Rect(0, 0, 1, 1))
@@ -640,7 +678,7 @@ class TestCommon(TestCase):
     def test_search_with_node_condition_only(self):
         """Tests search method with only a node constraint (no entry constraint)"""
         # Arrange
-        t = create_simple_tree(self)
+        t = create_simple_tree()
 
         def node_condition(node: RTreeNode):
             return node.get_bounding_rect().intersects(Rect(0, 0, 1, 1))
@@ -654,7 +692,7 @@ class TestCommon(TestCase):
     def test_search_with_entry_condition_only(self):
         """Tests search method with only an entry constraint (no node constraint)"""
         # Arrange
-        t = create_simple_tree(self)
+        t = create_simple_tree()
 
         def entry_condition(entry: RTreeEntry):
             return entry.data in ['a', 'c', 'e']
@@ -668,7 +706,7 @@ class TestCommon(TestCase):
     def test_search_with_no_conditions(self):
         """Tests search method with no constraints on node or entry (should return all leaf entries)"""
         # Arrange
-        t = create_simple_tree(self)
+        t = create_simple_tree()
 
         # Act
         result = list(t.search(None))
@@ -680,7 +718,7 @@ class TestCommon(TestCase):
         """Tests search_nodes method with leaves=True and a condition that results in no leaf nodes matching"""
         # Arrange
         nodes = dict()
-        t = create_complex_tree(self, nodes)
+        t = create_complex_tree(nodes)
 
         def condition(node: RTreeNode):
             return node.get_bounding_rect() == Rect(0, 5, 10, 10)
@@ -695,7 +733,7 @@ class TestCommon(TestCase):
         """Tests search_nodes method with leaves=True and a condition that results in a single leaf node matching"""
         # Arrange
         nodes = dict()
-        t = create_complex_tree(self, nodes)
+        t = create_complex_tree(nodes)
 
         def condition(node: RTreeNode):
             return node.get_bounding_rect().intersects(Rect(0, 9, 1, 10))
@@ -710,7 +748,7 @@ class TestCommon(TestCase):
         """Tests search_nodes method with leaves=True and a condition that results in multiple leaf nodes matching"""
         # Arrange
         nodes = dict()
-        t = create_complex_tree(self, nodes)
+        t = create_complex_tree(nodes)
         L1, L4 = nodes['L1'], nodes['L4']
 
         def condition(node: RTreeNode):
@@ -729,7 +767,7 @@ class TestCommon(TestCase):
         """
         # Arrange
         nodes = dict()
-        t = create_complex_tree(self, nodes)
+        t = create_complex_tree(nodes)
 
         def condition(node: RTreeNode):
             return node.get_bounding_rect() == Rect(8, 7, 10, 9)
@@ -747,7 +785,7 @@ class TestCommon(TestCase):
         """
         # Arrange
         nodes = dict()
-        t = create_complex_tree(self, nodes)
+        t = create_complex_tree(nodes)
 
         def condition(node: RTreeNode):
             return node.get_bounding_rect() == Rect(0, 0, 11, 10)
@@ -765,7 +803,7 @@ class TestCommon(TestCase):
         """
         # Arrange
         nodes = dict()
-        t = create_complex_tree(self, nodes)
+        t = create_complex_tree(nodes)
         R, I2, L3, L4 = nodes['R'], nodes['I2'], nodes['L3'], nodes['L4']
 
         def condition(node: RTreeNode):
@@ -777,6 +815,84 @@ class TestCommon(TestCase):
         # Assert
         self.assertCountEqual([R, I2, L3, L4], result)
 
+    def test_height(self):
+        """Ensure the height of the tree matches the number of levels."""
+        # Arrange
+        t1 = RTree()
+        t2 = create_simple_tree()
+        t3 = create_complex_tree()
+
+        # Act
+        heights = [t1.height, t2.height, t3.height]
+
+        # Assert
+        self.assertEqual([1, 2, 3], heights)
+        self.assertEqual([len(t.get_levels()) for t in (t1, t2, t3)], heights)
+
+    def test_bulk_load(self):
+        """
+        Ensure bulk loading packs all entries into a balanced tree, with each node respecting max_entries and
+        min_entries, and each parent entry's bounding rectangle encompassing its child node.
+        """
+        # Arrange
+        t = RTree(max_entries=4)
+        items = [(f'{x},{y}', Rect(x, y, x + 1, y + 1)) for x in range(6) for y in range(5)]
+
+        # Act
+        entries = t.bulk_load(items)
+
+        # Assert
+        self.assertEqual([data for data, _ in items], [e.data for e in entries])
+        self.assertCountEqual(entries, t.get_leaf_entries())
+        self.assertEqual(Rect(0, 0, 6, 5), t.root.get_bounding_rect())
+        levels = t.get_levels()
+        self.assertEqual(3, len(levels))
+        for node in t.get_nodes():
+            self.assertLessEqual(len(node.entries), t.max_entries)
+            if not node.is_root:
+                self.assertGreaterEqual(len(node.entries), t.min_entries)
+                self.assertEqual(node.get_bounding_rect(), node.parent_entry.rect)
+        self.assertCountEqual(levels[-1], t.get_leaves())
+
+    def test_bulk_load_groups_nearby_entries(self):
+        """Ensure bulk loading groups entries that are close to each other into the same leaf node."""
+        # Arrange
+        t = RTree(max_entries=2)
+        items = [('a', Rect(0, 0, 1, 1)), ('c', Rect(8, 8, 9, 9)), ('b', Rect(1, 1, 2, 2)), ('d', Rect(9, 9, 10, 10))]
+
+        # Act
+        t.bulk_load(items)
+
+        # Assert
+        leaves = [sorted(e.data for e in leaf.entries) for leaf in t.get_leaves()]
+        self.assertCountEqual([['a', 'b'], ['c', 'd']], leaves)
+
+    def test_bulk_load_includes_existing_entries(self):
+        """Ensure entries that were already in the tree are kept when bulk loading additional entries."""
+        # Arrange
+        t = create_simple_tree()
+
+        # Act
+        t.bulk_load([('f', Rect(2, 7, 3, 8)), ('g', Rect(6, 1, 7, 2))])
+
+        # Assert
+        self.assertCountEqual(['a', 'b', 'c', 'd', 'e', 'f', 'g'], [e.data for e in t.get_leaf_entries()])
+        self.assertEqual(Rect(0, 0, 10, 10), t.root.get_bounding_rect())
+
+    def test_bulk_load_empty(self):
+        """Bulk loading no entries into an empty tree should leave the tree with an empty root leaf node."""
+        # Arrange
+        t = RTree()
+
+        # Act
+        entries = t.bulk_load([])
+
+        # Assert
+        self.assertEqual([], entries)
+        self.assertTrue(t.root.is_leaf)
+        self.assertTrue(t.root.is_root)
+        self.assertEqual([], t.root.entries)
+
 
 def _yield_node(node: RTreeNode) -> Iterable[RTreeNode]:
     yield node
@@ -1,6 +1,7 @@
 from unittest import TestCase
-from rtreelib import RTreeGuttman, RTreeNode, RTreeEntry, Rect
+from rtreelib import RTreeGuttman, Rect
 from rtreelib.strategies.guttman import quadratic_split, adjust_tree_strategy
+from tests.util import build_from_leaves
 
 
 class TestGuttman(TestCase):
@@ -31,19 +32,14 @@ class TestGuttman(TestCase):
         """
         # Arrange
         t = RTreeGuttman(max_entries=3)
-        r1 = Rect(0, 0, 3, 2)
-        r2 = Rect(5, 5, 7, 7)
-        t.root = RTreeNode(t, is_leaf=False)
-        entry_a = RTreeEntry(r1, data='a')
-        entry_b = RTreeEntry(r2, data='b')
-        n1 = RTreeNode(t, is_leaf=True, parent=t.root, entries=[entry_a])
-        n2 = RTreeNode(t, is_leaf=True, parent=t.root, entries=[entry_b])
-        e1 = RTreeEntry(r1, child=n1)
-        e2 = RTreeEntry(r2, child=n2)
-        t.root.entries = [e1, e2]
-        # Arrange entry being inserted
-        r3 = Rect(2, 1, 4, 3)
-        entry_c = RTreeEntry(r3, data='c')
+        leaves = [
+            ('a', Rect(0, 0, 3, 2)),
+            ('b', Rect(5, 5, 7, 7)),
+            ('c', Rect(2, 1, 4, 3)),
+        ]
+        # Entry c is the entry being inserted, so it is not placed in a node yet
+        (n1, n2), (entry_a, entry_b, entry_c) = build_from_leaves(t, leaves, [[0], [1]])
+        e1, e2 = t.root.entries
         # Manually insert the new entry into node n1, but without adjusting the covering rectangle of the corresponding
         # parent entry in the root node (e1), since that is what we are testing.
         n1.entries.append(entry_c)
@@ -67,25 +63,18 @@ class TestGuttman(TestCase):
         """
         # Arrange
         t = RTreeGuttman(max_entries=3)
-        r1 = Rect(0, 0, 3, 2)
-        r2 = Rect(2, 1, 5, 3)
-        r3 = Rect(4, 2, 6, 4)
-        r4 = Rect(6, 6, 8, 8)
-        r5 = Rect(7, 7, 10, 9)
-        t.root = RTreeNode(t, is_leaf=False)
-        entry_a = RTreeEntry(r1, data='a')
-        entry_b = RTreeEntry(r2, data='b')
-        entry_c = RTreeEntry(r3, data='c')
-        entry_d = RTreeEntry(r4, data='d')
-        entry_e = RTreeEntry(r5, data='e')
-        n1 = RTreeNode(t, is_leaf=True, parent=t.root, entries=[entry_a, entry_b, entry_c])
-        n2 = RTreeNode(t, is_leaf=True, parent=t.root, entries=[entry_d, entry_e])
-        e1 = RTreeEntry(Rect(0, 0, 6, 4), child=n1)
-        e2 = RTreeEntry(Rect(6, 6, 10, 9), child=n2)
-        t.root.entries = [e1, e2]
-        # Arrange entry being inserted
-        r6 = Rect(1, 3, 2, 5)
-        entry_f = RTreeEntry(r6, data='f')
+        leaves = [
+            ('a', Rect(0, 0, 3, 2)),
+            ('b', Rect(2, 1, 5, 3)),
+            ('c', Rect(4, 2, 6, 4)),
+            ('d', Rect(6, 6, 8, 8)),
+            ('e', Rect(7, 7, 10, 9)),
+            ('f', Rect(1, 3, 2, 5)),
+        ]
+        # Entry f is the entry being inserted, so it is not placed in a node yet
+        (n1, n2), entries = build_from_leaves(t, leaves, [[0, 1, 2], [3, 4]])
+        entry_a, entry_b, entry_c, entry_d, entry_e, entry_f = entries
+        e1, e2 = t.root.entries
         # Manually insert the new entry into node n1, causing it to be overfull.
         n1.entries.append(entry_f)
         # Manually perform node split, but without adjusting the tree yet (since that is the focus of this test)
@@ -123,23 +112,16 @@ class TestGuttman(TestCase):
         """
         # Arrange
         t = RTreeGuttman(max_entries=2)
-        r1 = Rect(0, 0, 3, 2)
-        r2 = Rect(2, 1, 5, 3)
-        r3 = Rect(6, 6, 8, 8)
-        r4 = Rect(7, 7, 10, 9)
-        t.root = RTreeNode(t, is_leaf=False)
-        entry_a = RTreeEntry(r1, data='a')
-        entry_b = RTreeEntry(r2, data='b')
-        entry_c = RTreeEntry(r3, data='c')
-        entry_d = RTreeEntry(r4, data='d')
-        n1 = RTreeNode(t, is_leaf=True, parent=t.root, entries=[entry_a, entry_b])
-        n2 = RTreeNode(t, is_leaf=True, parent=t.root, entries=[entry_c, entry_d])
-        e1 = RTreeEntry(Rect(0, 0, 5, 3), child=n1)
-        e2 = RTreeEntry(Rect(6, 6, 10, 9), child=n2)
-        t.root.entries = [e1, e2]
-        # Arrange entry being inserted
-        r5 = Rect(4, 2, 6, 4)
-        entry_e = RTreeEntry(r5, data='e')
+        leaves = [
+            ('a', Rect(0, 0, 3, 2)),
+            ('b', Rect(2, 1, 5, 3)),
+            ('c', Rect(6, 6, 8, 8)),
+            ('d', Rect(7, 7, 10, 9)),
+            ('e', Rect(4, 2, 6, 4)),
+        ]
+        # Entry e is the entry being inserted, so it is not placed in a node yet
+        (n1, n2), (entry_a, entry_b, entry_c, entry_d, entry_e) = build_from_leaves(t, leaves, [[0, 1], [2, 3]])
+        e1, e2 = t.root.entries
         # Manually insert the new entry into node n1, causing it to be overfull.
         n1.entries.append(entry_e)
         # Manually perform node split, but without adjusting the tree yet (since that is the focus of this test)
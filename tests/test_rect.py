@@ -1,5 +1,6 @@
 from unittest import TestCase
 from rtreelib import Rect
+from rtreelib.models import union_all
 from math import isclose
 from rtreelib.rtree import EPSILON
 
@@ -45,6 +46,16 @@ class TestRect(TestCase):
         # Assert
         self.assertEqual(Rect(min_x=-2, min_y=-2, max_x=5, max_y=5), rect)
 
+    def test_union_all(self):
+        """Tests getting the bounding rectangle of several rectangles at once"""
+        # Arrange
+        rects = [Rect(2, 3, 4, 5), Rect(-1, 4, 3, 6), None, Rect(0, 0, 1, 1)]
+        # Act
+        rect = union_all(rects)
+        # Assert
+        self.assertEqual(Rect(-1, 0, 4, 6), rect)
+        self.assertIsNone(union_all([]))
+
     def test_intersection_area_disjoint(self):
         """
         Tests getting the intersection area of two completely disjoint (non-intersecting) rectangles with no overlap in
@@ -123,6 +134,17 @@ class TestRect(TestCase):
         # Assert
         self.assertFalse(result)
 
+    def test_union_area(self):
+        """Tests getting the area of the bounding rectangle of two rectangles"""
+        # Arrange
+        r1 = Rect(min_x=0, min_y=0, max_x=4, max_y=4)
+        r2 = Rect(min_x=2, min_y=2, max_x=5, max_y=6)
+        # Act
+        area = r1.get_union_area(r2)
+        # Assert
+        self.assertEqual(30, area)
+        self.assertEqual(r1.union(r2).area(), area)
+
     def test_intersection_area(self):
         """Tests getting the intersection area of two intersecting rectangles"""
         # Arrange
@@ -142,3 +164,14 @@ class TestRect(TestCase):
         # Assert
         self.assertTrue(isclose(4, centroid[0], rel_tol=EPSILON))
         self.assertTrue(isclose(3.5, centroid[1], rel_tol=EPSILON))
+
+    def test_hash_equal_rects(self):
+        """Ensures equal rectangles have the same hash, so they can be used as dictionary keys"""
+        # Arrange
+        r1 = Rect(0, 1, 5, 9)
+        r2 = Rect(0, 1, 5, 9)
+        # Act
+        lookup = {r1: 'a'}
+        # Assert
+        self.assertEqual(hash(r1), hash(r2))
+        self.assertEqual('a', lookup[r2])
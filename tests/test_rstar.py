@@ -1,10 +1,14 @@
-from typing import List, TypeVar
+import random
+from typing import List, TypeVar, Dict, Iterable, Any, FrozenSet
 from unittest import TestCase
-from unittest.mock import patch
+from unittest.mock import patch, Mock
 from rtreelib import Rect, RTreeNode, RTreeEntry
 from rtreelib.strategies.rstar import (
     RStarTree, rstar_overflow, rstar_choose_leaf, least_overlap_enlargement, get_possible_divisions,
-    choose_split_axis, choose_split_index, rstar_split, get_rstar_stat, EntryDistribution)
+    choose_split_axis, choose_split_index, rstar_split, get_rstar_stat, EntryDistribution, reinsert, _reinsert_entry,
+    _choose_subtree_reinsert, least_area_enlargement)
+from rtreelib.models import RStarCache
+from tests.util import build_from_leaves
 
 T = TypeVar('T')
 
@@ -41,8 +45,8 @@ class TestRStar(TestCase):
         # Assert
         self.assertEqual(b, entry)
 
-    @patch('rtreelib.strategies.rstar.least_overlap_enlargement')
-    @patch('rtreelib.strategies.rstar.least_area_enlargement')
+    @patch('rtreelib.strategies.rstar.least_overlap_enlargement', new_callable=Mock)
+    @patch('rtreelib.strategies.rstar.least_area_enlargement', new_callable=Mock)
     def test_choose_leaf_uses_least_overlap_enlargement_for_level_above_leaf(
             self, least_area_enlargement_mock, least_overlap_enlargement_mock):
         """
@@ -63,8 +67,8 @@ class TestRStar(TestCase):
         least_overlap_enlargement_mock.assert_called_once_with(root.entries, e.rect)
         least_area_enlargement_mock.assert_not_called()
 
-    @patch('rtreelib.strategies.rstar.least_overlap_enlargement')
-    @patch('rtreelib.strategies.rstar.least_area_enlargement')
+    @patch('rtreelib.strategies.rstar.least_overlap_enlargement', new_callable=Mock)
+    @patch('rtreelib.strategies.rstar.least_area_enlargement', new_callable=Mock)
     def test_choose_leaf_uses_least_area_enlargement_for_higher_levels(
             self, least_area_enlargement_mock, least_overlap_enlargement_mock):
         """
@@ -88,8 +92,8 @@ class TestRStar(TestCase):
         least_area_enlargement_mock.assert_called_once_with(root.entries, e.rect)
         least_overlap_enlargement_mock.assert_called_once_with(intermediate.entries, e.rect)
 
-    @patch('rtreelib.strategies.rstar.least_overlap_enlargement')
-    @patch('rtreelib.strategies.rstar.least_area_enlargement')
+    @patch('rtreelib.strategies.rstar.least_overlap_enlargement', new_callable=Mock)
+    @patch('rtreelib.strategies.rstar.least_area_enlargement', new_callable=Mock)
     def test_choose_leaf_returns_leaf_node_when_root_is_leaf(
             self, least_area_enlargement_mock, least_overlap_enlargement_mock):
         """
@@ -523,6 +527,28 @@ class TestRStar(TestCase):
         # Assert leaf entries
         self.assertCountEqual([entry_a, entry_b, entry_c, entry_d, entry_e], tree.get_leaf_entries())
 
+    def test_rstar_insert_after_bulk_load(self):
+        """
+        Ensure R* inserts (including the forced reinserts and splits they trigger) keep the tree valid after it has been
+        built using bulk_load.
+        """
+        # Arrange
+        tree = RStarTree(max_entries=4)
+        tree.bulk_load([(f'{x},{y}', Rect(x, y, x + 1, y + 1)) for x in range(6) for y in range(5)])
+
+        # Act
+        for i in range(10):
+            tree.insert(i, Rect(i / 2, 5 - i / 2, i / 2 + 1, 6 - i / 2))
+
+        # Assert
+        self.assertEqual(40, len(list(tree.get_leaf_entries())))
+        self.assertCountEqual(tree.get_levels()[-1], tree.get_leaves())
+        for node in tree.get_nodes():
+            self.assertLessEqual(len(node.entries), tree.max_entries)
+            if not node.is_root:
+                self.assertGreaterEqual(len(node.entries), tree.min_entries)
+                self.assertEqual(node.get_bounding_rect(), node.parent_entry.rect)
+
     @patch('rtreelib.strategies.rstar.rstar_split')
     def test_rstar_overflow_reinsert_without_split(self, rstar_split_mock):
         """
@@ -530,26 +556,8 @@ class TestRStar(TestCase):
         any additional overflows/splits occurring.
         """
         # Arrange
-        t = RStarTree(max_entries=3)
-        r1 = Rect(0, 0, 1, 1)
-        r2 = Rect(9, 0, 10, 1)
-        r3 = Rect(0, 1, 1, 2)
-        r4 = Rect(9, 5, 10, 6)
-        r5 = Rect(3, 2, 10, 4)
-        t.root = RTreeNode(t, is_leaf=False)
-        entry_a = RTreeEntry(r1, data='a')
-        entry_b = RTreeEntry(r2, data='b')
-        entry_c = RTreeEntry(r3, data='c')
-        entry_d = RTreeEntry(r4, data='d')
-        entry_e = RTreeEntry(r5, data='e')
-        n1 = RTreeNode(t, is_leaf=True, parent=t.root, entries=[entry_a, entry_c])
-        n2 = RTreeNode(t, is_leaf=True, parent=t.root, entries=[entry_b, entry_d, entry_e])
-        e1 = RTreeEntry(Rect(0, 0, 1, 2), child=n1)
-        e2 = RTreeEntry(Rect(3, 0, 10, 6), child=n2)
-        t.root.entries = [e1, e2]
-        # Arrange entry being inserted
-        r6 = Rect(2, 1, 3, 2)
-        entry_f = RTreeEntry(r6, data='f')
+        t, (n1, n2), (e1, e2), (entry_a, entry_b, entry_c, entry_d, entry_e, entry_f) = \
+            _create_reinsert_without_split_tree()
         # Manually insert the new entry into node n2, causing it to be overfull.
         n2.entries.append(entry_f)
         # Ensure preconditions:
@@ -572,11 +580,13 @@ class TestRStar(TestCase):
         self.assertEqual(n2, e2.child)
         # Forced insert should have resulted in entry f getting reinserted into node n1 (was previously in n2).
         # Ensure node n1 now has entries [a, c, f].
-        self.assertCountEqual([entry_a, entry_c, entry_f], n1.entries)
+        self.assertEqual(3, len(n1.entries))
+        self.assertEqual(_id_set([entry_a, entry_c, entry_f]), _id_set(n1.entries))
         # Ensure node n1 bounding box accommodates entries [a, c, f]
         self.assertEqual(Rect(0, 0, 3, 2), n1.get_bounding_rect())
         # Remaining entries [b, d, e] should be in node n2.
-        self.assertCountEqual([entry_b, entry_d, entry_e], n2.entries)
+        self.assertEqual(3, len(n2.entries))
+        self.assertEqual(_id_set([entry_b, entry_d, entry_e]), _id_set(n2.entries))
         self.assertEqual(Rect(3, 0, 10, 6), n2.get_bounding_rect())
         # Ensure nodes n1 and n2 are leaf nodes, and there are no additional levels in the tree.
         self.assertTrue(n1.is_leaf)
@@ -590,28 +600,7 @@ class TestRStar(TestCase):
         result in a regular split, not another forced reinsert.
         """
         # Arrange
-        t = RStarTree(max_entries=3)
-        r1 = Rect(0, 0, 1, 1)
-        r2 = Rect(0, 1, 1, 2)
-        r3 = Rect(9, 0, 10, 1)
-        r4 = Rect(0, 2, 1, 3)
-        r5 = Rect(9, 6, 10, 7)
-        r6 = Rect(3, 2, 10, 5)
-        t.root = RTreeNode(t, is_leaf=False)
-        entry_a = RTreeEntry(r1, data='a')
-        entry_b = RTreeEntry(r2, data='b')
-        entry_c = RTreeEntry(r3, data='c')
-        entry_d = RTreeEntry(r4, data='d')
-        entry_e = RTreeEntry(r5, data='e')
-        entry_f = RTreeEntry(r6, data='f')
-        n1 = RTreeNode(t, is_leaf=True, parent=t.root, entries=[entry_a, entry_b, entry_d])
-        n2 = RTreeNode(t, is_leaf=True, parent=t.root, entries=[entry_c, entry_e, entry_f])
-        e1 = RTreeEntry(Rect(0, 0, 1, 3), child=n1)
-        e2 = RTreeEntry(Rect(3, 0, 10, 7), child=n2)
-        t.root.entries = [e1, e2]
-        # Arrange entry being inserted
-        r7 = Rect(2, 1, 3, 2)
-        entry_g = RTreeEntry(r7, data='g')
+        t, (n1, n2), (e1, e2), (_, _, _, _, _, _, entry_g) = _create_reinsert_with_split_tree()
         # Manually insert the new entry into node n2, causing it to be overfull.
         n2.entries.append(entry_g)
         # Ensure preconditions:
@@ -633,16 +622,17 @@ class TestRStar(TestCase):
         # There should be 3 nodes at the leaf level
         leaf_nodes = levels[1]
         self.assertEqual(3, len(leaf_nodes))
+        nodes_by_data = _by_leaf_data(leaf_nodes)
         # One of the nodes should have entries [a, b] and with the correct bounding rectangle
-        n1 = next((n for n in leaf_nodes if set(_get_leaf_node_data(n)) == {'a', 'b'}))
+        n1 = nodes_by_data[frozenset({'a', 'b'})]
         self.assertEqual(Rect(0, 0, 1, 2), n1.get_bounding_rect())
         self.assertEqual(Rect(0, 0, 1, 2), n1.parent_entry.rect)
         # Another node should have entries [c, e, f] and with the correct bounding rectangle
-        n2 = next((n for n in leaf_nodes if set(_get_leaf_node_data(n)) == {'c', 'e', 'f'}))
+        n2 = nodes_by_data[frozenset({'c', 'e', 'f'})]
         self.assertEqual(Rect(3, 0, 10, 7), n2.get_bounding_rect())
         self.assertEqual(Rect(3, 0, 10, 7), n2.parent_entry.rect)
         # Last node should have entries [d, g] and with the correct bounding rectangle
-        n3 = next((n for n in leaf_nodes if set(_get_leaf_node_data(n)) == {'d', 'g'}))
+        n3 = nodes_by_data[frozenset({'d', 'g'})]
         self.assertEqual(Rect(0, 1, 3, 3), n3.get_bounding_rect())
         self.assertEqual(Rect(0, 1, 3, 3), n3.parent_entry.rect)
 
@@ -652,14 +642,7 @@ class TestRStar(TestCase):
         should not occur at the root level.
         """
         # Arrange
-        t = RStarTree(max_entries=3)
-        r1 = Rect(0, 0, 3, 2)
-        r2 = Rect(7, 7, 10, 9)
-        r3 = Rect(2, 1, 5, 3)
-        entry_a = RTreeEntry(r1, data='a')
-        entry_b = RTreeEntry(r2, data='b')
-        entry_c = RTreeEntry(r3, data='c')
-        t.root.entries = [entry_a, entry_b, entry_c]
+        t, (entry_a, entry_b, entry_c) = _create_split_root_tree()
         # Arrange entry being inserted. Since the root node is at max capacity, this entry should cause the root
         # to overflow.
         r4 = Rect(6, 6, 8, 8)
@@ -690,10 +673,12 @@ class TestRStar(TestCase):
         self.assertTrue(leaf_node_2.is_leaf)
         # Leaf node 1 should contain entries [a, c]
         self.assertEqual(Rect(0, 0, 5, 3), leaf_node_1.get_bounding_rect())
-        self.assertCountEqual([entry_a, entry_c], leaf_node_1.entries)
+        self.assertEqual(2, len(leaf_node_1.entries))
+        self.assertEqual(_id_set([entry_a, entry_c]), _id_set(leaf_node_1.entries))
         # Leaf node 2 should contain entries [b, d]
         self.assertEqual(Rect(6, 6, 10, 9), leaf_node_2.get_bounding_rect())
-        self.assertCountEqual([entry_b, entry_d], leaf_node_2.entries)
+        self.assertEqual(2, len(leaf_node_2.entries))
+        self.assertEqual(_id_set([entry_b, entry_d]), _id_set(leaf_node_2.entries))
 
     def test_rstar_overflow_reinsert_grow_tree(self):
         """
@@ -705,37 +690,8 @@ class TestRStar(TestCase):
         """
         # Arrange
         # Create a tree with 2 levels, with the root and all leaf nodes at capacity.
-        # Arrange
-        t = RStarTree(max_entries=3, min_entries=1)
-        r1 = Rect(0, 0, 5, 2)
-        r2 = Rect(1, 1, 5, 3)
-        r3 = Rect(2, 2, 6, 4)
-        r4 = Rect(5, 0, 12, 9)
-        r5 = Rect(7, 7, 20, 8)
-        r6 = Rect(4, 4, 13, 6)
-        r7 = Rect(16, 7, 19, 10)
-        r8 = Rect(16, 9, 18, 10)
-        r9 = Rect(18, 8, 19, 10)
-        t.root = RTreeNode(t, is_leaf=False)
-        entry_a = RTreeEntry(r1, data='a')
-        entry_b = RTreeEntry(r2, data='b')
-        entry_c = RTreeEntry(r3, data='c')
-        entry_d = RTreeEntry(r4, data='d')
-        entry_e = RTreeEntry(r5, data='e')
-        entry_f = RTreeEntry(r6, data='f')
-        entry_g = RTreeEntry(r7, data='g')
-        entry_h = RTreeEntry(r8, data='h')
-        entry_i = RTreeEntry(r9, data='i')
-        n1 = RTreeNode(t, is_leaf=True, parent=t.root, entries=[entry_a, entry_b, entry_c])
-        n2 = RTreeNode(t, is_leaf=True, parent=t.root, entries=[entry_d, entry_e, entry_f])
-        n3 = RTreeNode(t, is_leaf=True, parent=t.root, entries=[entry_g, entry_h, entry_i])
-        e1 = RTreeEntry(Rect(0, 0, 6, 4), child=n1)
-        e2 = RTreeEntry(Rect(4, 0, 20, 9), child=n2)
-        e3 = RTreeEntry(Rect(16, 7, 19, 10), child=n3)
-        t.root.entries = [e1, e2, e3]
-        # Arrange entry being inserted
-        r10 = Rect(18, 5, 20, 7)
-        entry_j = RTreeEntry(r10, data='j')
+        t, (_, n2, _), (entry_a, entry_b, entry_c, entry_d, entry_e, entry_f, entry_g, entry_h, entry_i, entry_j) = \
+            _create_reinsert_grow_tree()
         # Manually insert the new entry into node n2, causing it to be overfull.
         n2.entries.append(entry_j)
         # Ensure preconditions
@@ -777,13 +733,15 @@ class TestRStar(TestCase):
         # Assert
         # Tree should now have 3 levels
         self.assertEqual(3, len(t.get_levels()))
+        self.assertEqual(3, t.height)
         # Root node bounding box should encompass all entries
         self.assertEqual(Rect(0, 0, 20, 10), t.root.get_bounding_rect())
         # Root node should have 2 child entries
         self.assertEqual(2, len(t.root.entries))
         # Ensure entries in the root node have the expected bounding boxes
-        root_entry_1 = next((e for e in t.root.entries if e.rect == Rect(0, 0, 12, 9)))
-        root_entry_2 = next((e for e in t.root.entries if e.rect == Rect(4, 4, 20, 10)))
+        root_entries = _by_rect(t.root)
+        root_entry_1 = root_entries[Rect(0, 0, 12, 9)]
+        root_entry_2 = root_entries[Rect(4, 4, 20, 10)]
         # Ensure children nodes of root_entry_1 and root_entry_2 are intermediate nodes
         intermediate_node_1 = root_entry_1.child
         intermediate_node_2 = root_entry_2.child
@@ -798,11 +756,13 @@ class TestRStar(TestCase):
         self.assertEqual(2, len(intermediate_node_1.entries))
         self.assertEqual(3, len(intermediate_node_2.entries))
         # Ensure entries in the intermediate nodes have correct bounding boxes
-        intermediate_entry_1 = next(e for e in intermediate_node_1.entries if e.rect == Rect(0, 0, 6, 4))
-        intermediate_entry_2 = next(e for e in intermediate_node_1.entries if e.rect == Rect(5, 0, 12, 9))
-        intermediate_entry_3 = next(e for e in intermediate_node_2.entries if e.rect == Rect(18, 8, 19, 10))
-        intermediate_entry_4 = next(e for e in intermediate_node_2.entries if e.rect == Rect(7, 7, 20, 10))
-        intermediate_entry_5 = next(e for e in intermediate_node_2.entries if e.rect == Rect(4, 4, 20, 7))
+        intermediate_entries_1 = _by_rect(intermediate_node_1)
+        intermediate_entries_2 = _by_rect(intermediate_node_2)
+        intermediate_entry_1 = intermediate_entries_1[Rect(0, 0, 6, 4)]
+        intermediate_entry_2 = intermediate_entries_1[Rect(5, 0, 12, 9)]
+        intermediate_entry_3 = intermediate_entries_2[Rect(18, 8, 19, 10)]
+        intermediate_entry_4 = intermediate_entries_2[Rect(7, 7, 20, 10)]
+        intermediate_entry_5 = intermediate_entries_2[Rect(4, 4, 20, 7)]
         # Get leaf child nodes
         leaf_node_1 = intermediate_entry_1.child
         leaf_node_2 = intermediate_entry_2.child
@@ -823,19 +783,78 @@ class TestRStar(TestCase):
         self.assertFalse(leaf_node_5.is_root)
         # Leaf node 1 should have entries [a, b, c]
         self.assertEqual(Rect(0, 0, 6, 4), leaf_node_1.get_bounding_rect())
-        self.assertCountEqual([entry_a, entry_b, entry_c], leaf_node_1.entries)
+        self.assertEqual(3, len(leaf_node_1.entries))
+        self.assertEqual(_id_set([entry_a, entry_b, entry_c]), _id_set(leaf_node_1.entries))
         # Leaf node 2 should have entry [d]
         self.assertEqual(Rect(5, 0, 12, 9), leaf_node_2.get_bounding_rect())
-        self.assertCountEqual([entry_d], leaf_node_2.entries)
+        self.assertEqual(1, len(leaf_node_2.entries))
+        self.assertEqual(_id_set([entry_d]), _id_set(leaf_node_2.entries))
         # Leaf node 3 should have entry [i]
         self.assertEqual(Rect(18, 8, 19, 10), leaf_node_3.get_bounding_rect())
-        self.assertCountEqual([entry_i], leaf_node_3.entries)
+        self.assertEqual(1, len(leaf_node_3.entries))
+        self.assertEqual(_id_set([entry_i]), _id_set(leaf_node_3.entries))
         # Leaf node 4 should have entries [e, g, h]
         self.assertEqual(Rect(7, 7, 20, 10), leaf_node_4.get_bounding_rect())
-        self.assertCountEqual([entry_e, entry_g, entry_h], leaf_node_4.entries)
+        self.assertEqual(3, len(leaf_node_4.entries))
+        self.assertEqual(_id_set([entry_e, entry_g, entry_h]), _id_set(leaf_node_4.entries))
         # Leaf node 5 should have entries [f, j]
         self.assertEqual(Rect(4, 4, 20, 7), leaf_node_5.get_bounding_rect())
-        self.assertCountEqual([entry_f, entry_j], leaf_node_5.entries)
+        self.assertEqual(2, len(leaf_node_5.entries))
+        self.assertEqual(_id_set([entry_f, entry_j]), _id_set(leaf_node_5.entries))
+
+    def test_reinsert_leaf_level_after_upper_level_reinsert(self):
+        """
+        When a forced reinsert at an upper level is followed by a reinsert at the leaf level during the same insert,
+        ensure that the leaf nodes in the subtrees that were detached (and then reattached) by the upper-level reinsert
+        are still considered when choosing where to reinsert the leaf entry.
+        """
+        # Arrange
+        t, (n1, n2, n3, n4, n5), (l1, l2, l3, l4, l5), upper_node = _create_upper_level_reinsert_tree()
+        t._cache = RStarCache()
+        # The upper-level node is overfull. A forced reinsert detaches the subtrees rooted at n2 and n3 (the entries
+        # closest to its centroid), then reattaches them to the node containing n5, without causing a split.
+        reinsert(t, upper_node, 2)
+        self.assertEqual([n1, n4], [e.child for e in upper_node.entries])
+        self.assertCountEqual([n1, n2, n3, n4, n5], t.get_levels()[2])
+        entry = RTreeEntry(Rect(2.2, 0.2, 2.8, 0.8), data='x')
+
+        # Act
+        _reinsert_entry(t, entry, 0)
+
+        # Assert
+        # Leaves l2 and l5 both contain the entry's rectangle, so neither needs to be enlarged. Leaf l2 is chosen since
+        # it has the smaller area.
+        self.assertIn(entry, l2.entries)
+
+    def test_choose_subtree_reinsert_matches_fresh_levels(self):
+        """
+        Ensure that the subtree chosen during a forced reinsert (which reads the levels cache) is the same one that
+        would be chosen from a fresh level-order traversal of the tree, including after splits and reinserts at upper
+        levels have changed the structure of the tree in the middle of an insert.
+        """
+        # Arrange
+        rnd = random.Random(0)
+        tree = RStarTree(max_entries=3)
+        results = []
+
+        def choose_subtree_reinsert(t, rect, levels_from_leaf):
+            node = _choose_subtree_reinsert(t, rect, levels_from_leaf)
+            levels = t.get_levels()
+            entries = [n.parent_entry for n in levels[len(levels) - levels_from_leaf - 1]]
+            strategy = least_overlap_enlargement if levels_from_leaf == 0 else least_area_enlargement
+            results.append((levels_from_leaf, node is strategy(entries, rect).child))
+            return node
+
+        # Act
+        with patch('rtreelib.strategies.rstar._choose_subtree_reinsert', side_effect=choose_subtree_reinsert):
+            for i in range(200):
+                x, y = rnd.uniform(0, 100), rnd.uniform(0, 100)
+                tree.insert(i, Rect(x, y, x + rnd.uniform(0, 3), y + rnd.uniform(0, 3)))
+
+        # Assert
+        # Reinserts should have occurred at the leaf level as well as at upper levels
+        self.assertEqual({0, 1, 2, 3, 4}, {levels_from_leaf for levels_from_leaf, _ in results})
+        self.assertEqual([], [r for r in results if not r[1]])
 
 
 def _get_leaf_node_data(node: RTreeNode[T]) -> List[T]:
@@ -846,3 +865,122 @@ def _get_leaf_node_data(node: RTreeNode[T]) -> List[T]:
     """
     assert node.is_leaf
     return [e.data for e in node.entries]
+
+
+def _by_leaf_data(nodes: Iterable[RTreeNode[T]]) -> Dict[FrozenSet[T], RTreeNode[T]]:
+    """
+    Returns the given leaf nodes keyed by the set of data in their entries, so each node can be looked up directly
+    rather than rescanning every node's entries for each lookup.
+    :param nodes: Leaf nodes in an R-tree
+    :return: Dictionary mapping the set of data elements in each leaf node to the node
+    """
+    return {frozenset(_get_leaf_node_data(n)): n for n in nodes}
+
+
+def _id_set(items: Iterable[Any]) -> FrozenSet[int]:
+    """
+    Returns the identities of the given items (e.g., entries in a node) as a set, which allows comparing two groups of
+    entries regardless of their order without hashing or comparing the entries themselves.
+    """
+    return frozenset(map(id, items))
+
+
+def _by_rect(node: RTreeNode[T]) -> Dict[Rect, RTreeEntry[T]]:
+    """
+    Returns the entries in a node keyed by their bounding rectangle
+    :param node: Node in an R-tree
+    :return: Dictionary mapping each entry's bounding rectangle to the entry
+    """
+    return {e.rect: e for e in node.entries}
+
+
+def _create_reinsert_without_split_tree():
+    """
+    Creates a tree with 2 leaf nodes: n1 containing entries [a, c], and n2 (which is at capacity) containing entries
+    [b, d, e]. Entry f is created but not inserted.
+    """
+    t = RStarTree(max_entries=3)
+    leaves = [
+        ('a', Rect(0, 0, 1, 1)),
+        ('b', Rect(9, 0, 10, 1)),
+        ('c', Rect(0, 1, 1, 2)),
+        ('d', Rect(9, 5, 10, 6)),
+        ('e', Rect(3, 2, 10, 4)),
+        ('f', Rect(2, 1, 3, 2)),
+    ]
+    nodes, entries = build_from_leaves(t, leaves, [[0, 2], [1, 3, 4]])
+    return t, tuple(nodes), tuple(t.root.entries), tuple(entries)
+
+
+def _create_reinsert_with_split_tree():
+    """
+    Creates a tree with 2 leaf nodes at capacity: n1 containing entries [a, b, d], and n2 containing entries [c, e, f].
+    Entry g is created but not inserted.
+    """
+    t = RStarTree(max_entries=3)
+    leaves = [
+        ('a', Rect(0, 0, 1, 1)),
+        ('b', Rect(0, 1, 1, 2)),
+        ('c', Rect(9, 0, 10, 1)),
+        ('d', Rect(0, 2, 1, 3)),
+        ('e', Rect(9, 6, 10, 7)),
+        ('f', Rect(3, 2, 10, 5)),
+        ('g', Rect(2, 1, 3, 2)),
+    ]
+    nodes, entries = build_from_leaves(t, leaves, [[0, 1, 3], [2, 4, 5]])
+    return t, tuple(nodes), tuple(t.root.entries), tuple(entries)
+
+
+def _create_split_root_tree():
+    """Creates a tree with a single (root) leaf node at capacity, containing entries [a, b, c]."""
+    t = RStarTree(max_entries=3)
+    leaves = [
+        ('a', Rect(0, 0, 3, 2)),
+        ('b', Rect(7, 7, 10, 9)),
+        ('c', Rect(2, 1, 5, 3)),
+    ]
+    t.root.entries = [RTreeEntry(rect, data=data) for data, rect in leaves]
+    return t, tuple(t.root.entries)
+
+
+def _create_reinsert_grow_tree():
+    """
+    Creates a tree with 2 levels, with the root and all leaf nodes at capacity: n1 containing entries [a, b, c], n2
+    containing entries [d, e, f], and n3 containing entries [g, h, i]. Entry j is created but not inserted.
+    """
+    t = RStarTree(max_entries=3, min_entries=1)
+    leaves = [
+        ('a', Rect(0, 0, 5, 2)),
+        ('b', Rect(1, 1, 5, 3)),
+        ('c', Rect(2, 2, 6, 4)),
+        ('d', Rect(5, 0, 12, 9)),
+        ('e', Rect(7, 7, 20, 8)),
+        ('f', Rect(4, 4, 13, 6)),
+        ('g', Rect(16, 7, 19, 10)),
+        ('h', Rect(16, 9, 18, 10)),
+        ('i', Rect(18, 8, 19, 10)),
+        ('j', Rect(18, 5, 20, 7)),
+    ]
+    nodes, entries = build_from_leaves(t, leaves, [[0, 1, 2], [3, 4, 5], [6, 7, 8]])
+    return t, tuple(nodes), tuple(entries)
+
+
+def _create_upper_level_reinsert_tree():
+    """
+    Creates a tree with 4 levels. The root has 2 children at level 2: an overfull node containing entries for nodes
+    [n1, n2, n3, n4], and a node containing an entry for n5. Each of the level 1 nodes [n1, n2, n3, n4, n5] contains a
+    single leaf node [l1, l2, l3, l4, l5] respectively, each holding one leaf entry. The rectangle of n5 covers both n2
+    and n3, and is smaller than the rectangle of the overfull node.
+    """
+    t = RStarTree(max_entries=3, min_entries=1)
+    rects = [Rect(0, 0, 1, 1), Rect(2, 0, 3, 1), Rect(4, 0, 5, 1), Rect(6, 0, 7, 1), Rect(1.5, 0, 5.5, 1)]
+    leaves = [RTreeNode(t, is_leaf=True, entries=[RTreeEntry(rect, data=i)]) for i, rect in enumerate(rects)]
+    nodes = [RTreeNode(t, is_leaf=False, entries=[RTreeEntry(rect, child=leaf)]) for rect, leaf in zip(rects, leaves)]
+    upper_node = RTreeNode(t, is_leaf=False, entries=[RTreeEntry(rect, child=node)
+                                                      for rect, node in zip(rects[:4], nodes[:4])])
+    other_node = RTreeNode(t, is_leaf=False, entries=[RTreeEntry(rects[4], child=nodes[4])])
+    t.root = RTreeNode(t, is_leaf=False, entries=[RTreeEntry(Rect(0, 0, 7, 1), child=upper_node),
+                                                  RTreeEntry(rects[4], child=other_node)])
+    for node in [t.root, upper_node, other_node] + nodes:
+        t._fix_children(node)
+    return t, tuple(nodes), tuple(leaves), upper_node
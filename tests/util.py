@@ -2,17 +2,17 @@
 Utility functions for creating R-trees shared across multiple tests. These use the default Guttman implementation.
 """
 
-from typing import Dict, Optional
+from typing import Dict, Optional, List, Tuple, Any
 from unittest import TestCase
-from rtreelib import Rect, RTree, RTreeEntry, RTreeNode
+from rtreelib import Rect, RTree, RTreeBase, RTreeEntry, RTreeNode
 
 
-def create_simple_tree(test: TestCase, nodes: Optional[Dict[str, RTreeNode]] = None,
+def create_simple_tree(nodes: Optional[Dict[str, RTreeNode]] = None,
                        entries: Optional[Dict[str, RTreeEntry]] = None) -> RTree:
     """
-    Creates a simple R-tree with 5 entries split across 3 nodes (1 root, 2 leaves). Asserts that the resulting tree has
-    the expected structure, and optionally sets the nodes/entries in the passed in dictionaries for easy access (if
-    provided).
+    Creates a simple R-tree with 5 entries split across 3 nodes (1 root, 2 leaves), and optionally sets the
+    nodes/entries in the passed in dictionaries for easy access (if provided). The structure of the resulting tree is
+    verified once by check_simple_tree (see test_create_simple_tree) rather than on every call.
 
     Resulting structure:
     * Root [R]: Rect(0, 0, 10, 10)
@@ -26,16 +26,28 @@ def create_simple_tree(test: TestCase, nodes: Optional[Dict[str, RTreeNode]] = N
     t.insert('d', Rect(8, 8, 10, 10))
     t.insert('e', Rect(9, 9, 10, 10))
 
-    # Ensure tree has expected structure
+    # Assign nodes and entries to the corresponding dictionary for easy access (if passed in)
+    root_entry_1, root_entry_2 = t.root.entries
+    if nodes is not None:
+        nodes['R'] = t.root
+        nodes['L1'] = root_entry_1.child
+        nodes['L2'] = root_entry_2.child
+    if entries is not None:
+        entries.update(get_entries_by_data(root_entry_1.child))
+        entries.update(get_entries_by_data(root_entry_2.child))
+
+    return t
+
+
+def check_simple_tree(test: TestCase, t: RTree) -> None:
+    """Asserts that a tree created by create_simple_tree has the expected structure."""
     # Root node bounding rectangle should encompass all entries
     test.assertEqual(Rect(0, 0, 10, 10), t.root.get_bounding_rect())
     # Root node should have 2 child entries
     test.assertEqual(2, len(t.root.entries))
     root_entry_1, root_entry_2 = t.root.entries
-    # Root entry 1 bounding rectangle should encompass leaf entries [a, b, c]
-    test.assertEqual(Rect(0, 0, 6, 6), root_entry_1.rect)
-    # Root entry 2 bounding rectangle should encompass leaf entries [d, e]
-    test.assertEqual(Rect(8, 8, 10, 10), root_entry_2.rect)
+    # Root entry bounding rectangles should encompass leaf entries [a, b, c] and [d, e] respectively
+    test.assertEqual([Rect(0, 0, 6, 6), Rect(8, 8, 10, 10)], [root_entry_1.rect, root_entry_2.rect])
     # Get the leaf nodes
     leaf_node_1 = root_entry_1.child
     leaf_node_2 = root_entry_2.child
@@ -47,44 +59,35 @@ def create_simple_tree(test: TestCase, nodes: Optional[Dict[str, RTreeNode]] = N
     test.assertFalse(leaf_node_2.is_root)
     # Leaf node 1 should contain entries [a, b, c]
     test.assertEqual(3, len(leaf_node_1.entries))
-    entry_a = get_entry(leaf_node_1, 'a')
-    entry_b = get_entry(leaf_node_1, 'b')
-    entry_c = get_entry(leaf_node_1, 'c')
+    leaf_entries_1 = get_entries_by_data(leaf_node_1)
+    entry_a = leaf_entries_1['a']
+    entry_b = leaf_entries_1['b']
+    entry_c = leaf_entries_1['c']
     # Leaf node 2 should contain entries [d, e]
     test.assertEqual(2, len(leaf_node_2.entries))
-    entry_d = get_entry(leaf_node_2, 'd')
-    entry_e = get_entry(leaf_node_2, 'e')
+    leaf_entries_2 = get_entries_by_data(leaf_node_2)
+    entry_d = leaf_entries_2['d']
+    entry_e = leaf_entries_2['e']
     # Ensure leaf node bounding rectangles are correct
-    test.assertEqual(Rect(0, 0, 6, 6), leaf_node_1.get_bounding_rect())
-    test.assertEqual(Rect(8, 8, 10, 10), leaf_node_2.get_bounding_rect())
+    test.assertEqual([Rect(0, 0, 6, 6), Rect(8, 8, 10, 10)],
+                     [leaf_node_1.get_bounding_rect(), leaf_node_2.get_bounding_rect()])
     # Ensure leaf entry bounding rectangles are correct
-    test.assertEqual(Rect(0, 0, 5, 5), entry_a.rect)
-    test.assertEqual(Rect(1, 1, 3, 3), entry_b.rect)
-    test.assertEqual(Rect(4, 4, 6, 6), entry_c.rect)
-    test.assertEqual(Rect(8, 8, 10, 10), entry_d.rect)
-    test.assertEqual(Rect(9, 9, 10, 10), entry_e.rect)
+    test.assertEqual([
+        ('a', Rect(0, 0, 5, 5)),
+        ('b', Rect(1, 1, 3, 3)),
+        ('c', Rect(4, 4, 6, 6)),
+        ('d', Rect(8, 8, 10, 10)),
+        ('e', Rect(9, 9, 10, 10))
+    ], [(e.data, e.rect) for e in (entry_a, entry_b, entry_c, entry_d, entry_e)])
 
-    # Assign nodes and entries to the corresponding dictionary for easy access (if passed in)
-    if nodes is not None:
-        nodes['R'] = t.root
-        nodes['L1'] = leaf_node_1
-        nodes['L2'] = leaf_node_2
-    if entries is not None:
-        entries['a'] = entry_a
-        entries['b'] = entry_b
-        entries['c'] = entry_c
-        entries['d'] = entry_d
-        entries['e'] = entry_e
 
-    return t
-
-
-def create_complex_tree(test: TestCase, nodes: Optional[Dict[str, RTreeNode]] = None,
+def create_complex_tree(nodes: Optional[Dict[str, RTreeNode]] = None,
                         entries: Optional[Dict[str, RTreeEntry]] = None) -> RTree:
     """
     Creates a more complex R-tree with 10 entries split across 7 nodes (1 root, 2 children at level 1, then a total
-    of 4 leaf nodes at level 2). Asserts that the resulting tree has the expected structure, and optionally sets the
-    nodes/entries in the passed in dictionaries for easy access (if provided).
+    of 4 leaf nodes at level 2), and optionally sets the nodes/entries in the passed in dictionaries for easy access (if
+    provided). The structure of the resulting tree is verified once by check_complex_tree (see
+    test_create_complex_tree) rather than on every call.
 
     Resulting structure:
     * Root [R]: Rect(0, 0, 11, 10)
@@ -107,16 +110,30 @@ def create_complex_tree(test: TestCase, nodes: Optional[Dict[str, RTreeNode]] =
     t.insert('i', Rect(9, 0, 11, 3))
     t.insert('j', Rect(0, 5, 2, 7))
 
-    # Ensure tree has expected structure
+    # Assign nodes and entries to the corresponding dictionary for easy access (if passed in)
+    intermediate_node_1, intermediate_node_2 = (e.child for e in t.root.entries)
+    leaf_nodes = [e.child for e in intermediate_node_1.entries + intermediate_node_2.entries]
+    if nodes is not None:
+        nodes['R'] = t.root
+        nodes['I1'] = intermediate_node_1
+        nodes['I2'] = intermediate_node_2
+        nodes['L1'], nodes['L2'], nodes['L3'], nodes['L4'] = leaf_nodes
+    if entries is not None:
+        for leaf_node in leaf_nodes:
+            entries.update(get_entries_by_data(leaf_node))
+
+    return t
+
+
+def check_complex_tree(test: TestCase, t: RTree) -> None:
+    """Asserts that a tree created by create_complex_tree has the expected structure."""
     # Root node bounding rectangle should encompass all entries
     test.assertEqual(Rect(0, 0, 11, 10), t.root.get_bounding_rect())
     # Root node should have 2 child entries
     test.assertEqual(2, len(t.root.entries))
     root_entry_1, root_entry_2 = t.root.entries
-    # Root entry 1 bounding rectangle should encompass leaf entries [d, e, f, g, j]
-    test.assertEqual(Rect(0, 5, 10, 10), root_entry_1.rect)
-    # Root entry 2 bounding rectangle should encompass leaf entries [a, b, c, h, i]
-    test.assertEqual(Rect(0, 0, 11, 5), root_entry_2.rect)
+    # Root entry bounding rectangles should encompass leaf entries [d, e, f, g, j] and [a, b, c, h, i] respectively
+    test.assertEqual([Rect(0, 5, 10, 10), Rect(0, 0, 11, 5)], [root_entry_1.rect, root_entry_2.rect])
     # Get the children nodes corresponding to the entries in the root node.
     intermediate_node_1 = root_entry_1.child
     intermediate_node_2 = root_entry_2.child
@@ -125,24 +142,21 @@ def create_complex_tree(test: TestCase, nodes: Optional[Dict[str, RTreeNode]] =
     test.assertFalse(intermediate_node_1.is_root)
     test.assertFalse(intermediate_node_2.is_leaf)
     test.assertFalse(intermediate_node_2.is_root)
-    # Intermediate node 1 should contain 2 child entries
+    # Intermediate nodes should each contain 2 child entries
     test.assertEqual(2, len(intermediate_node_1.entries))
-    # Intermediate node 1 bounding rectangle should encompass leaf entries [f, g, j]
-    test.assertEqual(Rect(0, 5, 10, 10), intermediate_node_1.get_bounding_rect())
-    # Intermediate node 2 should contain 2 child entries
     test.assertEqual(2, len(intermediate_node_2.entries))
-    # Intermediate node 2 bounding rectangle should encompass leaf entries [d, e]
-    test.assertEqual(Rect(0, 0, 11, 5), intermediate_node_2.get_bounding_rect())
+    # Intermediate node bounding rectangles should match the rectangles of their entries in the root node
+    test.assertEqual([Rect(0, 5, 10, 10), Rect(0, 0, 11, 5)],
+                     [intermediate_node_1.get_bounding_rect(), intermediate_node_2.get_bounding_rect()])
     # Get references to the entries in the intermediate nodes
     intermediate_entry_1 = intermediate_node_1.entries[0]
     intermediate_entry_2 = intermediate_node_1.entries[1]
     intermediate_entry_3 = intermediate_node_2.entries[0]
     intermediate_entry_4 = intermediate_node_2.entries[1]
     # Ensure the bounding rectangles are correct for the entries in the intermediate nodes
-    test.assertEqual(Rect(0, 5, 4, 10), intermediate_entry_1.rect)
-    test.assertEqual(Rect(6, 6, 10, 9), intermediate_entry_2.rect)
-    test.assertEqual(Rect(7, 0, 11, 5), intermediate_entry_3.rect)
-    test.assertEqual(Rect(0, 0, 6, 4), intermediate_entry_4.rect)
+    test.assertEqual(
+        [Rect(0, 5, 4, 10), Rect(6, 6, 10, 9), Rect(7, 0, 11, 5), Rect(0, 0, 6, 4)],
+        [e.rect for e in (intermediate_entry_1, intermediate_entry_2, intermediate_entry_3, intermediate_entry_4)])
     # Get the leaf nodes from the child entries of the intermediate nodes
     leaf_node_1 = intermediate_entry_1.child
     leaf_node_2 = intermediate_entry_2.child
@@ -155,62 +169,68 @@ def create_complex_tree(test: TestCase, nodes: Optional[Dict[str, RTreeNode]] =
     test.assertTrue(leaf_node_4.is_leaf)
     # Leaf node 1 should contain entries [f, g, j]
     test.assertEqual(3, len(leaf_node_1.entries))
-    entry_f = get_entry(leaf_node_1, 'f')
-    entry_g = get_entry(leaf_node_1, 'g')
-    entry_j = get_entry(leaf_node_1, 'j')
+    leaf_entries_1 = get_entries_by_data(leaf_node_1)
+    entry_f = leaf_entries_1['f']
+    entry_g = leaf_entries_1['g']
+    entry_j = leaf_entries_1['j']
     # Leaf node 2 should contain entries [d, e]
     test.assertEqual(2, len(leaf_node_2.entries))
-    entry_d = get_entry(leaf_node_2, 'd')
-    entry_e = get_entry(leaf_node_2, 'e')
+    leaf_entries_2 = get_entries_by_data(leaf_node_2)
+    entry_d = leaf_entries_2['d']
+    entry_e = leaf_entries_2['e']
     # Leaf node 3 should contain entries [h, i]
     test.assertEqual(2, len(leaf_node_3.entries))
-    entry_h = get_entry(leaf_node_3, 'h')
-    entry_i = get_entry(leaf_node_3, 'i')
+    leaf_entries_3 = get_entries_by_data(leaf_node_3)
+    entry_h = leaf_entries_3['h']
+    entry_i = leaf_entries_3['i']
     # Leaf node 4 should contain entries [a, b, c]
     test.assertEqual(3, len(leaf_node_4.entries))
-    entry_a = get_entry(leaf_node_4, 'a')
-    entry_b = get_entry(leaf_node_4, 'b')
-    entry_c = get_entry(leaf_node_4, 'c')
+    leaf_entries_4 = get_entries_by_data(leaf_node_4)
+    entry_a = leaf_entries_4['a']
+    entry_b = leaf_entries_4['b']
+    entry_c = leaf_entries_4['c']
     # Ensure leaf node bounding rectangles are correct
-    test.assertEqual(Rect(0, 5, 4, 10), leaf_node_1.get_bounding_rect())
-    test.assertEqual(Rect(6, 6, 10, 9), leaf_node_2.get_bounding_rect())
-    test.assertEqual(Rect(7, 0, 11, 5), leaf_node_3.get_bounding_rect())
-    test.assertEqual(Rect(0, 0, 6, 4), leaf_node_4.get_bounding_rect())
+    test.assertEqual(
+        [Rect(0, 5, 4, 10), Rect(6, 6, 10, 9), Rect(7, 0, 11, 5), Rect(0, 0, 6, 4)],
+        [n.get_bounding_rect() for n in (leaf_node_1, leaf_node_2, leaf_node_3, leaf_node_4)])
     # Ensure leaf entry bounding rectangles are correct
-    test.assertEqual(Rect(0, 0, 5, 2), entry_a.rect)
-    test.assertEqual(Rect(1, 1, 2, 3), entry_b.rect)
-    test.assertEqual(Rect(2, 2, 6, 4), entry_c.rect)
-    test.assertEqual(Rect(6, 6, 9, 8), entry_d.rect)
-    test.assertEqual(Rect(8, 7, 10, 9), entry_e.rect)
-    test.assertEqual(Rect(1, 5, 3, 9), entry_f.rect)
-    test.assertEqual(Rect(2, 8, 4, 10), entry_g.rect)
-    test.assertEqual(Rect(7, 2, 10, 5), entry_h.rect)
-    test.assertEqual(Rect(9, 0, 11, 3), entry_i.rect)
-    test.assertEqual(Rect(0, 5, 2, 7), entry_j.rect)
+    test.assertEqual([
+        ('a', Rect(0, 0, 5, 2)),
+        ('b', Rect(1, 1, 2, 3)),
+        ('c', Rect(2, 2, 6, 4)),
+        ('d', Rect(6, 6, 9, 8)),
+        ('e', Rect(8, 7, 10, 9)),
+        ('f', Rect(1, 5, 3, 9)),
+        ('g', Rect(2, 8, 4, 10)),
+        ('h', Rect(7, 2, 10, 5)),
+        ('i', Rect(9, 0, 11, 3)),
+        ('j', Rect(0, 5, 2, 7))
+    ], [(e.data, e.rect) for e in (entry_a, entry_b, entry_c, entry_d, entry_e, entry_f, entry_g, entry_h, entry_i,
+                                   entry_j)])
 
-    # Assign nodes and entries to the corresponding dictionary for easy access (if passed in)
-    if nodes is not None:
-        nodes['R'] = t.root
-        nodes['I1'] = intermediate_node_1
-        nodes['I2'] = intermediate_node_2
-        nodes['L1'] = leaf_node_1
-        nodes['L2'] = leaf_node_2
-        nodes['L3'] = leaf_node_3
-        nodes['L4'] = leaf_node_4
-    if entries is not None:
-        entries['a'] = entry_a
-        entries['b'] = entry_b
-        entries['c'] = entry_c
-        entries['d'] = entry_d
-        entries['e'] = entry_e
-        entries['f'] = entry_f
-        entries['g'] = entry_g
-        entries['h'] = entry_h
-        entries['i'] = entry_i
-        entries['j'] = entry_j
 
-    return t
+def build_from_leaves(tree: RTreeBase, leaves: List[Tuple[Any, Rect]], leaf_layout: List[List[int]])\
+        -> Tuple[List[RTreeNode], List[RTreeEntry]]:
+    """
+    Builds a tree with 2 levels (a root node, and a level of leaf nodes below it) having an exact layout, for tests that
+    need a particular starting structure that may not be easily reachable through regular inserts. The root node's
+    entries get bounding rectangles that encompass their leaf nodes.
+    :param tree: Tree whose root node will be replaced
+    :param leaves: List of (data, rect) tuples for the leaf entries, in the same order as bulk_load accepts them. An
+        entry is created for each one.
+    :param leaf_layout: List of leaf nodes to create, each given as a list of indices into 'leaves'. Leaf entries whose
+        index does not appear in the layout are created but not placed in the tree.
+    :return: Tuple of the created leaf nodes (in the same order as the layout) and the created leaf entries (in the same
+        order as 'leaves')
+    """
+    entries = [RTreeEntry(rect, data=data) for data, rect in leaves]
+    tree.root = RTreeNode(tree, is_leaf=False)
+    nodes = [RTreeNode(tree, is_leaf=True, parent=tree.root, entries=[entries[i] for i in indices])
+             for indices in leaf_layout]
+    tree.root.entries = [RTreeEntry(node.get_bounding_rect(), child=node) for node in nodes]
+    return nodes, entries
 
 
-def get_entry(node: RTreeNode, data: str):
-    return next((e for e in node.entries if e.data == data))
+def get_entries_by_data(node: RTreeNode) -> Dict[Any, RTreeEntry]:
+    """Returns the entries of a node keyed by their data, so that several entries can be looked up with a single scan."""
+    return {e.data: e for e in node.entries}